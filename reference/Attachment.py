@@ -0,0 +1,360 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : Attachment.py
+  - Description      : Extract text of attached files (PDF/HWP/HWPX/DOCX)
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from urllib.parse import unquote, urlsplit
+from xml.etree import ElementTree
+
+from requests.exceptions import RequestException
+
+import Transport
+import Worker
+
+try:
+    import Hyperparms
+    ATTACH_EN = getattr(Hyperparms, "ATTACH_EN", True)
+    ATTACH_WORKERS = getattr(Hyperparms, "ATTACH_WORKERS", 2)
+    ATTACH_MAX_FILES = getattr(Hyperparms, "ATTACH_MAX_FILES", 3)
+    ATTACH_MAX_BYTES = getattr(Hyperparms, "ATTACH_MAX_BYTES", 20 * 1024 * 1024)
+    ATTACH_MAX_PAGES = getattr(Hyperparms, "ATTACH_MAX_PAGES", 30)
+    ATTACH_MAX_CHARS = getattr(Hyperparms, "ATTACH_MAX_CHARS", 30000)
+    ATTACH_TIMEOUT = getattr(Hyperparms, "ATTACH_TIMEOUT", 60)
+except:
+    ATTACH_EN = True                        # 첨부파일 텍스트 추출 사용 여부
+    ATTACH_WORKERS = 2                      # 동시에 실행할 추출 프로세스 수
+    ATTACH_MAX_FILES = 3                    # 공지 하나당 최대 첨부파일 수
+    ATTACH_MAX_BYTES = 20 * 1024 * 1024     # 파일 하나당 최대 다운로드 크기 (바이트)
+    ATTACH_MAX_PAGES = 30                   # 파일 하나당 최대 페이지(구역) 수
+    ATTACH_MAX_CHARS = 30000                # 파일 하나당 최대 추출 글자 수
+    ATTACH_TIMEOUT = 60                     # 파일 하나당 최대 추출 시간 (초, 추출 시작부터)
+
+CACHE_FILE = "buffers/attachment_cache.db"
+CHUNK_SIZE = 64 * 1024
+
+EXTENSIONS = ("pdf", "hwp", "hwpx", "docx")
+EXTENSION_PATTERN = re.compile(r"\.(" + "|".join(EXTENSIONS) + r")\b", re.IGNORECASE)
+# 확장자가 보이지 않는 게시판 다운로드 링크
+DOWNLOAD_PATTERN = re.compile(r"download|filedown|file_down|fileDown|attach", re.IGNORECASE)
+
+_runner = Worker.Runner(ATTACH_WORKERS)
+_cache = Worker.Cache(CACHE_FILE, """CREATE TABLE IF NOT EXISTS attachments (
+                                        url TEXT NOT NULL,
+                                        validator TEXT NOT NULL,
+                                        text TEXT NOT NULL,
+                                        created_at REAL NOT NULL,
+                                        PRIMARY KEY (url, validator))""")
+_stats = Worker.Counters(files=0, cache_hits=0, skipped=0, failed=0, seconds=0.0)
+_count = _stats.count
+
+
+def Stats():
+    return _stats.snapshot()
+
+
+def IsAttachment(href, name=""):
+    """True for links that look like an attached document."""
+    path = unquote(urlsplit(href).path)
+    return bool(EXTENSION_PATTERN.search(path) or EXTENSION_PATTERN.search(name or "")
+                or DOWNLOAD_PATTERN.search(href))
+
+
+def _lookup(url, validator):
+    with _cache.connect() as conn:
+        row = conn.execute("SELECT text FROM attachments WHERE url = ? AND validator = ?",
+                           (url, validator)).fetchone()
+    return row[0] if row else None
+
+
+def _store(url, validator, text):
+    with _cache.connect() as conn:
+        # 같은 주소의 이전 버전은 삭제
+        conn.execute("DELETE FROM attachments WHERE url = ?", (url,))
+        conn.execute("INSERT INTO attachments (url, validator, text, created_at) VALUES (?, ?, ?, ?)",
+                     (url, validator, text, time.time()))
+
+
+# ---------------------------------------------------------------------------
+# 형식별 추출 (추출 프로세스에서 실행, 페이지/구역 단위로 읽고 글자 수 제한에서 중단)
+# ---------------------------------------------------------------------------
+
+class TextBudget:
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.parts = []
+        self.chars = 0
+
+    def add(self, text):
+        """Append text; returns False once the budget is used up."""
+        text = text.strip()
+        if text:
+            text = text[:self.max_chars - self.chars]
+            self.parts.append(text)
+            self.chars += len(text) + 1
+        return self.chars < self.max_chars
+
+    def text(self):
+        return "\n".join(self.parts)
+
+
+def _pdf_text(path, budget, max_pages):
+    from pypdf import PdfReader
+
+    # 파일 전체를 읽지 않고 mmap으로 필요한 부분만 접근
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        reader = PdfReader(mapped)
+        for page in reader.pages[:max_pages]:
+            if not budget.add(page.extract_text() or ""):
+                break
+
+
+def _xml_text(stream, budget, text_tag, paragraph_tag):
+    # 문단 단위로 읽고 처리한 요소는 바로 해제
+    texts = []
+    for event, element in ElementTree.iterparse(stream, events=("end",)):
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == text_tag and element.text:
+            texts.append(element.text)
+        elif tag == paragraph_tag:
+            if not budget.add("".join(texts)):
+                return False
+            texts = []
+            element.clear()
+    return budget.add("".join(texts))
+
+
+def _docx_text(path, budget, max_pages):
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as stream:
+        _xml_text(stream, budget, "t", "p")
+
+
+def _hwpx_text(path, budget, max_pages):
+    with zipfile.ZipFile(path) as archive:
+        sections = sorted((name for name in archive.namelist() if re.match(r"Contents/section\d+\.xml$", name)),
+                          key=lambda name: int(re.search(r"\d+", name).group()))
+        for name in sections[:max_pages]:
+            with archive.open(name) as stream:
+                if not _xml_text(stream, budget, "t", "p"):
+                    break
+
+
+HWPTAG_PARA_TEXT = 67
+# 문단 글자 중 1글자 크기의 제어 문자 (나머지 제어 문자는 8글자 크기)
+HWP_CHAR_CONTROLS = {0, 10, 13, 24, 25, 26, 27, 28, 29, 30, 31}
+
+
+def _hwp_para_text(data):
+    chars = []
+    i = 0
+    while i + 1 < len(data):
+        code = data[i] | (data[i + 1] << 8)
+        if code >= 32:
+            chars.append(chr(code))
+            i += 2
+        elif code in HWP_CHAR_CONTROLS:
+            if code in (10, 13):
+                chars.append("\n")
+            i += 2
+        else:
+            i += 16
+    return "".join(chars)
+
+
+def _hwp_text(path, budget, max_pages):
+    import olefile
+
+    with olefile.OleFileIO(path) as ole:
+        # FileHeader 36번째 바이트의 첫 비트 : 본문 압축 여부
+        compressed = bool(ole.openstream("FileHeader").read()[36] & 1)
+        sections = sorted((entry for entry in ole.listdir() if entry[0] == "BodyText"),
+                          key=lambda entry: int(entry[1][len("Section"):]))
+
+        for entry in sections[:max_pages]:
+            data = ole.openstream(entry).read()
+            if compressed:
+                data = zlib.decompress(data, -15)
+
+            # 레코드 헤더 : tag(10비트) level(10비트) size(12비트, 0xFFF면 다음 4바이트)
+            offset = 0
+            while offset + 4 <= len(data):
+                header = struct.unpack_from("<I", data, offset)[0]
+                tag, size = header & 0x3FF, (header >> 20) & 0xFFF
+                offset += 4
+                if size == 0xFFF:
+                    size = struct.unpack_from("<I", data, offset)[0]
+                    offset += 4
+                if tag == HWPTAG_PARA_TEXT and not budget.add(_hwp_para_text(data[offset:offset + size])):
+                    return
+                offset += size
+
+
+EXTRACTORS = {"pdf": _pdf_text, "docx": _docx_text, "hwpx": _hwpx_text, "hwp": _hwp_text}
+
+
+def DetectType(path):
+    """File type from the magic bytes (the link name is often missing or wrong)."""
+    with open(path, 'rb') as file:
+        head = file.read(8)
+    if head.startswith(b"%PDF"):
+        return "pdf"
+    if head.startswith(b"\xd0\xcf\x11\xe0"):
+        return "hwp"
+    if head.startswith(b"PK"):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                names = set(archive.namelist())
+        except zipfile.BadZipFile:
+            return None
+        if "word/document.xml" in names:
+            return "docx"
+        if any(name.startswith("Contents/section") for name in names):
+            return "hwpx"
+    return None
+
+
+def _extract(path, file_type, max_chars, max_pages):
+    # 추출 프로세스에서 실행, (텍스트, 추출 시간) 반환
+    start = time.perf_counter()
+    budget = TextBudget(max_chars)
+    EXTRACTORS[file_type](path, budget, max_pages)
+    return budget.text(), time.perf_counter() - start
+
+
+# ---------------------------------------------------------------------------
+# 다운로드, 캐시, 병렬 추출
+# ---------------------------------------------------------------------------
+
+def _download(response, file):
+    # 크기 제한을 넘으면 중단, 본문은 임시 파일로 (메모리에 올리지 않음)
+    if int(response.headers.get("Content-Length") or 0) > ATTACH_MAX_BYTES:
+        return None
+    digest = hashlib.sha256()
+    received = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        received += len(chunk)
+        if received > ATTACH_MAX_BYTES:
+            return None
+        digest.update(chunk)
+        file.write(chunk)
+    file.flush()
+    return digest.hexdigest()
+
+
+class Job:
+    def __init__(self, url, name):
+        self.url = url
+        self.name = name
+        self.text = None
+        self.path = None
+        self.file_type = None
+        self.size = 0
+        self.validator = None
+        self.future = None
+
+
+def _prepare(job):
+    """Download job.url unless the cache already has its text."""
+    response = Transport.Get(job.url, stream=True)
+    try:
+        if response.status_code != 200:
+            return False
+
+        # 1. ETag (없으면 Last-Modified)로 캐시 확인, 적중시 본문은 받지 않음
+        validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        if validator:
+            job.validator = "etag:" + validator
+            job.text = _lookup(job.url, job.validator)
+            if job.text is not None:
+                _count("cache_hits")
+                return True
+
+        # 2. 다운로드 (검증값이 없으면 내용 해시로 캐시)
+        file = tempfile.NamedTemporaryFile(prefix="attach_", delete=False)
+        job.path = file.name
+        with file:
+            digest = _download(response, file)
+        if digest is None:
+            return False
+        job.size = os.path.getsize(job.path)
+        if job.validator is None:
+            job.validator = "sha256:" + digest
+            job.text = _lookup(job.url, job.validator)
+            if job.text is not None:
+                _count("cache_hits")
+                return True
+
+        job.file_type = DetectType(job.path)
+        return job.file_type is not None
+    finally:
+        response.close()
+
+
+def ExtractAttachments(attachments):
+    """Return the text of the attached files as [(name, text)].
+
+    attachments is a list of (url, name). Files are downloaded with a size
+    cap into temporary files and parsed page by page in worker processes;
+    the text is cached by url + ETag (or content hash).
+    """
+    if not ATTACH_EN:
+        return []
+
+    jobs = [Job(url, name) for url, name in list(dict.fromkeys(attachments))[:ATTACH_MAX_FILES]]
+    try:
+        # 1. 다운로드, 캐시 확인
+        for job in jobs:
+            _count("files")
+            try:
+                ready = _prepare(job)
+            except (RequestException, OSError) as e:
+                print(f"[Attachment] {job.name} : {e}")
+                ready = False
+            if not ready:
+                _count("skipped")
+                continue
+            if job.text is None:
+                job.future = _runner.submit(_extract, job.path, job.file_type,
+                                            ATTACH_MAX_CHARS, ATTACH_MAX_PAGES, timeout=ATTACH_TIMEOUT)
+
+        # 2. 추출 결과 수집 (파일별 시간 제한, 소요 시간 출력)
+        for job in jobs:
+            if job.future is None:
+                continue
+            try:
+                job.text, elapsed = job.future.result()
+            except Exception as e:
+                # 시간 초과시 해당 파일의 추출 프로세스만 종료됨
+                print(f"[Attachment] {job.name} : {type(e).__name__}: {e}")
+                _count("failed")
+                continue
+
+            _count("seconds", elapsed)
+            print(f"[Attachment] {job.name} ({job.file_type}, {job.size} bytes) : "
+                  f"{len(job.text)} chars in {elapsed:.2f}s")
+            _store(job.url, job.validator, job.text)
+    finally:
+        for job in jobs:
+            if job.path:
+                try:
+                    os.remove(job.path)
+                except OSError:
+                    pass
+
+    return [(job.name, job.text) for job in jobs if job.text]
+
+
+def Shutdown():
+    _runner.shutdown()
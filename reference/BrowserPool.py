@@ -0,0 +1,175 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : BrowserPool.py
+  - Description      : Keep warm headless browsers alive across pages
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+
+try:
+    import Hyperparms
+    DEBUG_EN = getattr(Hyperparms, "DEBUG_EN", False)
+    BROWSER_POOL_SIZE = getattr(Hyperparms, "BROWSER_POOL_SIZE", 2)
+    BROWSER_MAX_USES = getattr(Hyperparms, "BROWSER_MAX_USES", 20)
+except:
+    DEBUG_EN = False
+    BROWSER_POOL_SIZE = 2   # 동시에 띄워둘 브라우저 수
+    BROWSER_MAX_USES = 20   # 브라우저 하나당 최대 페이지 수 (초과시 재시작)
+
+FIREFOX_BINARY = "/usr/bin/firefox"
+GECKODRIVER_PATH = "/usr/local/bin/geckodriver"
+
+
+def CreateDriver():
+    """Start a new webdriver process."""
+    from selenium import webdriver
+    from selenium.webdriver.firefox.service import Service
+    from selenium.webdriver.firefox.options import Options
+
+    if DEBUG_EN:
+        # Chrome 사용
+        return webdriver.Chrome()
+
+    # Firefox 옵션 설정 (headless 예시 포함)
+    options = Options()
+    options.add_argument('--headless')
+
+    # Firefox 실행 파일 위치 지정
+    options.binary_location = FIREFOX_BINARY
+    # geckodriver 서비스 설정
+    service = Service(executable_path=GECKODRIVER_PATH)
+    # 웹드라이버 객체 생성
+    return webdriver.Firefox(service=service, options=options)
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class BrowserPool:
+    def __init__(self, size=BROWSER_POOL_SIZE, max_uses=BROWSER_MAX_USES):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.created = 0
+        self.recycled = 0
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(item):
+        try:
+            item.driver.quit()
+        except Exception:
+            pass
+
+    def _take(self):
+        # 대기중인 브라우저가 있으면 재사용, 없으면 새로 생성
+        while True:
+            try:
+                item = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._is_alive(item.driver):
+                return item
+            self._quit(item)
+            with self._lock:
+                self.recycled += 1
+
+        item = PooledDriver(CreateDriver())
+        with self._lock:
+            self.created += 1
+        return item
+
+    def _give_back(self, item):
+        item.uses += 1
+
+        # 사용 횟수 초과, 비정상 종료, 풀 종료시 폐기
+        if self._closed or item.uses >= self.max_uses or not self._is_alive(item.driver):
+            self._quit(item)
+            with self._lock:
+                self.recycled += 1
+            return
+
+        self._idle.put(item)
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a warm driver; it goes back to the pool afterwards."""
+        if self._closed:
+            raise RuntimeError("BrowserPool is already shut down")
+
+        self._slots.acquire()
+        try:
+            item = self._take()
+            try:
+                yield item.driver
+            finally:
+                self._give_back(item)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                item = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(item)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def GetPool():
+    """Return the process-wide browser pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = BrowserPool()
+        return _pool
+
+
+def Acquire():
+    return GetPool().acquire()
+
+
+def Stats():
+    """Return driver counters of the process-wide pool (None if never used)."""
+    with _pool_lock:
+        if _pool is None:
+            return None
+        return {"size": _pool.size, "idle": _pool._idle.qsize(),
+                "created": _pool.created, "recycled": _pool.recycled}
+
+
+def Shutdown():
+    """Quit every idle browser of the process-wide pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+atexit.register(Shutdown)
@@ -0,0 +1,195 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : Checkpoint.py
+  - Description      : Per-run journal so a retry resumes where it failed
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import threading
+
+from SeenStore import MAX_ATTEMPTS
+
+JOURNAL_FILE = "buffers/checkpoint.jsonl"
+
+# 학과별 상태 : 공지 요약 완료(fetched) → 공지별 전달(delivered) → 학과 완료(done)
+# fetched/done은 한 실행(cron 실행 또는 스케줄러 주기) 안에서만 유효하고 Compact에서 제거,
+# 전달되지 않은 공지는 다음 실행으로 넘기되 전달 시도 횟수를 MAX_ATTEMPTS로 제한
+_lock = threading.Lock()
+_state = None
+_attempted = set()  # 이번 실행에서 전달을 시도한 (학과, 주소)
+_failed = set()     # 이번 실행에서 가져오기/요약에 실패한 (학과, 주소)
+
+
+def _new_dept_state():
+    return {"fetched": False, "done": False, "notices": [], "delivered": set(), "attempts": {}}
+
+
+def _apply(state, event):
+    dept = state.setdefault(event["dept"], _new_dept_state())
+    kind = event["event"]
+    if kind == "summarized":
+        dept["notices"].append((event["title"], event["url"], event["summary"]))
+        dept["attempts"][event["url"]] = event.get("attempts", 1)
+    elif kind == "attempted":
+        dept["attempts"][event["url"]] = dept["attempts"].get(event["url"], 1) + 1
+    elif kind == "fetched":
+        dept["fetched"] = True
+    elif kind == "delivered":
+        dept["delivered"].add(event["url"])
+    elif kind == "done":
+        dept["done"] = True
+
+
+def _load():
+    global _state
+    if _state is not None:
+        return _state
+
+    _state = {}
+    try:
+        with open(JOURNAL_FILE, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    _apply(_state, json.loads(line))
+                except (json.JSONDecodeError, KeyError):
+                    # 기록 도중 종료된 마지막 줄은 무시
+                    continue
+    except FileNotFoundError:
+        pass
+    return _state
+
+
+def _write(events):
+    #부모 디렉터리 없으면 생성
+    os.makedirs(os.path.dirname(JOURNAL_FILE), exist_ok=True)
+
+    with open(JOURNAL_FILE, 'a', encoding='utf-8') as file:
+        for event in events:
+            file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def _record(events):
+    with _lock:
+        state = _load()
+        _write(events)
+        for event in events:
+            _apply(state, event)
+
+
+def IsDone(dept_id):
+    with _lock:
+        dept = _load().get(dept_id)
+        return dept is not None and dept["done"]
+
+
+def IsFetched(dept_id):
+    with _lock:
+        dept = _load().get(dept_id)
+        return dept is not None and dept["fetched"]
+
+
+def _retryable(dept_id, dept, url):
+    # 이번 실행에서 이미 시도한 공지는 횟수와 관계없이 다시 전달 (연결 오류 재시도)
+    return (dept_id, url) in _attempted or dept["attempts"].get(url, 1) < MAX_ATTEMPTS
+
+
+def Pending(dept_id):
+    """Return (title, url, summary) of summarized notices not yet delivered,
+    leaving out the ones already tried MAX_ATTEMPTS times."""
+    with _lock:
+        dept = _load().get(dept_id)
+        if dept is None:
+            return []
+        return [notice for notice in dept["notices"]
+                if notice[1] not in dept["delivered"] and _retryable(dept_id, dept, notice[1])]
+
+
+def RecordSummarized(dept_id, notice_list, fetched=True):
+    """Journal summarized notices; fetched=False while more may follow (streaming)."""
+    events = [{"event": "summarized", "dept": dept_id, "title": notice.title,
+               "url": notice.url, "summary": notice.summary} for notice in notice_list]
+    if fetched:
+        events.append({"event": "fetched", "dept": dept_id})
+    _record(events)
+    with _lock:
+        _attempted.update((dept_id, notice.url) for notice in notice_list)
+
+
+def RecordAttempt(dept_id, url):
+    """Count another delivery attempt of a pending notice (once per run);
+    returns the number of attempts so far."""
+    with _lock:
+        state = _load()
+        if (dept_id, url) not in _attempted:
+            event = {"event": "attempted", "dept": dept_id, "url": url}
+            _write([event])
+            _apply(state, event)
+            _attempted.add((dept_id, url))
+        return state[dept_id]["attempts"].get(url, 1)
+
+
+def RecordFetched(dept_id):
+    _record([{"event": "fetched", "dept": dept_id}])
+
+
+def RecordDelivered(dept_id, url):
+    _record([{"event": "delivered", "dept": dept_id, "url": url}])
+
+
+def RecordFailed(dept_id, url):
+    """Remember a notice that failed in this run; False if it already did."""
+    with _lock:
+        if (dept_id, url) in _failed:
+            return False
+        _failed.add((dept_id, url))
+        return True
+
+
+def RecordDone(dept_id):
+    _record([{"event": "done", "dept": dept_id}])
+
+
+def Compact():
+    """End the current run: drop done/fetched flags and delivered notices,
+    keeping only undelivered notices with attempts left for the next run
+    (which checks the board again and re-delivers them)."""
+    global _state
+    with _lock:
+        state = _load()
+        _attempted.clear()
+        _failed.clear()
+
+        pending = {}
+        for dept_id, dept in state.items():
+            notices = [notice for notice in dept["notices"]
+                       if notice[1] not in dept["delivered"] and _retryable(dept_id, dept, notice[1])]
+            if notices:
+                pending[dept_id] = (notices, dept["attempts"])
+
+        if not pending:
+            if os.path.exists(JOURNAL_FILE):
+                os.remove(JOURNAL_FILE)
+            _state = {}
+            return
+
+        events = []
+        for dept_id, (notices, attempts) in pending.items():
+            for title, url, summary in notices:
+                events.append({"event": "summarized", "dept": dept_id, "title": title,
+                               "url": url, "summary": summary, "attempts": attempts.get(url, 1)})
+
+        tmp_path = JOURNAL_FILE + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            for event in events:
+                file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, JOURNAL_FILE)
+
+        _state = {}
+        for event in events:
+            _apply(_state, event)
@@ -0,0 +1,96 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : Chunker.py
+  - Description      : Split long notices into chunks under a token budget
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import math
+import re
+
+try:
+    import Hyperparms
+    CHARS_PER_TOKEN = getattr(Hyperparms, "CHARS_PER_TOKEN", 1.5)
+except:
+    CHARS_PER_TOKEN = 1.5  # 토큰 하나당 평균 글자 수 (한국어 기준 추정치)
+
+# 공지 본문에서 자주 쓰는 제목 형태
+#   1. / 가. / (1) / ① / □ ■ ○ ◎ ▶ / [제목] / 제3조 / # 제목
+HEADING_PATTERN = re.compile(r"^\s*(?:\d{1,2}\.\s|[가-하]\.\s|\(\d{1,2}\)|[①-⑳]|[□■○◎●◆◇▶▣※]"
+                             r"|\[[^\]]{1,40}\]|제\s*\d+\s*[조장절]|#{1,6}\s)")
+
+# 문장 경계 (마침표 등 뒤의 공백, 또는 줄바꿈)
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def EstimateTokens(text):
+    """Rough token count of text (no tokenizer dependency)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _sections(text):
+    # 제목 줄을 기준으로 구역 나누기
+    sections = []
+    current = []
+    for line in text.splitlines():
+        if HEADING_PATTERN.match(line) and current:
+            sections.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current))
+    return [section for section in sections if section.strip()]
+
+
+def _pieces(section, max_tokens):
+    # 구역이 예산 안이면 그대로, 넘으면 문장 단위, 문장도 넘으면 글자 수 단위로 자름
+    if EstimateTokens(section) <= max_tokens:
+        return [section]
+
+    max_chars = max(1, int(max_tokens * CHARS_PER_TOKEN))
+    pieces = []
+    for sentence in SENTENCE_PATTERN.split(section):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if EstimateTokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+        else:
+            pieces.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+    return pieces
+
+
+def Split(text, max_tokens):
+    """Split text into chunks of at most max_tokens (estimated).
+
+    Headings start new sections; sections are packed greedily and only
+    split further (by sentence, then by length) when a single section is
+    over budget. A chunk that is at least half full always ends at a
+    heading, so an edit only moves the boundaries up to the next heading
+    and the other chunks (and their cached summaries) stay the same.
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for section in _sections(text):
+        # 절반 이상 찼으면 제목에서 끊어 경계를 고정
+        if current and current_tokens >= max_tokens // 2:
+            chunks.append("\n".join(current))
+            current = []
+            current_tokens = 0
+
+        for piece in _pieces(section, max_tokens):
+            tokens = EstimateTokens(piece) + 1  # 구분 줄바꿈 포함
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += tokens
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -7,12 +7,26 @@
 *******************************************************************'''
 
 # -*- coding: utf-8 -*-
-import http.client
 import json
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from Errors import SummaryError
+import Transport
+import SummaryCache
+import Secrets
 
 API_INFO_FILE = 'secrets/clovastudio-api-info.json'
+SUMMARY_TIMEOUT = (Transport.CONNECT_TIMEOUT, 60)  # 요약 응답은 오래 걸릴 수 있음
+MAX_INPUT_CHARS = 35000  # 요약 API 입력 최대 글자 수
+
+try:
+    import Hyperparms
+    SUMMARY_WORKERS = getattr(Hyperparms, "SUMMARY_WORKERS", 4)
+except:
+    SUMMARY_WORKERS = 4  # 동시에 보낼 요약 요청 수 (프로세스 전체, 유료 API)
+
+# 학과 수 x 학과별 요약 스레드 x 요청별 스레드로 늘어나지 않도록 전체 동시 요청 수 제한
+_request_slots = threading.BoundedSemaphore(SUMMARY_WORKERS)
 
 class CompletionExecutor:
     def __init__(self, host, api_key, api_key_primary_val, request_id, url_key):
@@ -22,20 +36,20 @@ class CompletionExecutor:
         self._request_id = request_id
         self._url_key = url_key
 
-    def _send_request(self, completion_request):
-        headers = {
+        # 요청마다 같은 값이므로 미리 생성
+        self._url = f'https://{self._host}/testapp/v1/api-tools/summarization/v2/{self._url_key}'
+        self._headers = {
             'Content-Type': 'application/json; charset=utf-8',
             'X-NCP-CLOVASTUDIO-API-KEY': self._api_key,
             'X-NCP-APIGW-API-KEY': self._api_key_primary_val,
             'X-NCP-CLOVASTUDIO-REQUEST-ID': self._request_id
         }
 
-        conn = http.client.HTTPSConnection(self._host)
-        conn.request('POST', f'/testapp/v1/api-tools/summarization/v2/{self._url_key}', 
-                     json.dumps(completion_request), headers)
-        response = conn.getresponse()
-        result = json.loads(response.read().decode(encoding='utf-8'))
-        conn.close()
+    def _send_request(self, completion_request):
+        # 공용 세션을 사용하여 TLS 연결 재사용
+        response = Transport.Post(self._url, data=json.dumps(completion_request), headers=self._headers,
+                                  timeout=SUMMARY_TIMEOUT)
+        result = json.loads(response.content.decode(encoding='utf-8'))
         return result
 
     def execute(self, completion_request):
@@ -49,35 +63,34 @@ class CompletionExecutor:
 
 
 def LoadSecrets(file_path):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Configuration file not found: {file_path}")
-
-    with open(file_path, 'r', encoding='utf-8') as file:
-        try:
-            api_info = json.load(file)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON format in {file_path}: {e}")
+    # 파일이 바뀐 경우에만 다시 읽음
+    return Secrets.Load(file_path, {'api_key', 'api_key_primary_val', 'request_id'})
 
-    required_keys = {'api_key', 'api_key_primary_val', 'request_id'}
-    if not required_keys.issubset(api_info.keys()):
-        raise ValueError(f"Missing required keys in JSON file: {required_keys - api_info.keys()}")
-
-    return api_info
-
-
-def Summarize(content):
-    """Summarize the given content using Clova Studio API."""
-    # Load API keys and configuration
-    api_info = LoadSecrets(API_INFO_FILE)
 
-    # Create an instance of CompletionExecutor
-    completion_executor = CompletionExecutor(
+def GetExecutor():
+    """Return the long-lived CompletionExecutor (rebuilt only when the secrets file changes)."""
+    return Secrets.Derived(API_INFO_FILE, "executor", lambda api_info: CompletionExecutor(
         host='clovastudio.apigw.ntruss.com',
         api_key=api_info['api_key'],
         api_key_primary_val=api_info['api_key_primary_val'],
         request_id=api_info['request_id'],
         url_key=api_info['url_key']
-    )
+    ), {'api_key', 'api_key_primary_val', 'request_id'})
+
+
+def Summarize(content):
+    """Summarize the given content using Clova Studio API."""
+    # 이미 요약한 내용이면 API 호출 생략
+    summary = SummaryCache.Get(content)
+    if summary is not None:
+        return summary
+
+    return _RequestSummary(content)
+
+
+def _RequestSummary(content):
+    # Reuse the cached CompletionExecutor
+    completion_executor = GetExecutor()
 
     # Prepare the request data
     request_data = {
@@ -90,7 +103,45 @@ def Summarize(content):
     }
 
     # Execute the API call and return the response
-    return completion_executor.execute(request_data)
+    with _request_slots:
+        summary = completion_executor.execute(request_data)
+    SummaryCache.Put(content, summary)
+    return summary
+
+
+def SummarizeMany(contents):
+    """Summarize several contents at once.
+
+    Returns a list aligned with contents; an item is None when its
+    summary failed (SummaryError), so one bad notice does not fail the rest.
+    """
+    # 요약 API는 "texts" 전체를 하나의 요약으로 합치므로 공지 여러개를 한 요청에 담을 수 없음
+    # 대신 중복을 제거하고, 캐시에 없는 항목만 공용 세션으로 동시에 요청
+    unique_contents = list(dict.fromkeys(contents))
+    results = {}
+
+    pending = []
+    for content in unique_contents:
+        summary = SummaryCache.Get(content)
+        if summary is not None:
+            results[content] = summary
+        else:
+            pending.append(content)
+
+    def summarize_one(content):
+        try:
+            return _RequestSummary(content)
+        except SummaryError:
+            return None
+
+    if len(pending) == 1:
+        results[pending[0]] = summarize_one(pending[0])
+    elif pending:
+        with ThreadPoolExecutor(max_workers=SUMMARY_WORKERS) as executor:
+            for content, summary in zip(pending, executor.map(summarize_one, pending)):
+                results[content] = summary
+
+    return [results[content] for content in contents]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,213 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : CompiledScraper.py
+  - Description      : Compile AutoScraper models into fixed CSS selectors
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import urljoin
+
+import soupsieve
+
+import ModelRegistry
+
+_lock = threading.Lock()
+_rules = {}  # model_id -> ((compiled mtime, model mtime), compiled)
+
+
+def CompiledPath(model_id):
+    return f"{ModelRegistry.MODEL_DIR}/compiled_{model_id}.json"
+
+
+def _file_hash(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _quote(value):
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _attr_selector(name, value):
+    # autoscraper(BeautifulSoup)와 동일한 규칙
+    #   '' : 속성이 없거나 비어있음
+    #   list : 나열된 값 중 하나라도 가짐 (class)
+    #   str : 값이 정확히 일치
+    if not value:
+        return f":not([{name}]:not([{name}='']))"
+    if name == "class":
+        values = value if isinstance(value, list) else value.split()
+        return ":is(" + ", ".join("." + soupsieve.escape(v) for v in values) + ")"
+    return f"[{name}={_quote(value)}]"
+
+
+def _node_selector(tag, attrs):
+    return tag + "".join(_attr_selector(name, attrs[name]) for name in sorted(attrs))
+
+
+def CompileStack(stack):
+    """Turn one AutoScraper stack (root-to-leaf path) into a CSS selector."""
+    content = [item for item in stack["content"] if item[0] != "[document]"]
+
+    selectors = [_node_selector(item[0], item[1]) for item in content]
+
+    # autoscraper는 부모마다 학습시 위치(n번째)의 자식만 선택
+    if len(content) >= 2:
+        selectors[-1] = f"{selectors[-1]}:nth-child({content[-2][2] + 1} of {selectors[-1]})"
+
+    # 최상위 노드는 문서의 루트 (findAll(recursive=False)로 탐색 시작)
+    selectors[0] += ":root"
+    return " > ".join(selectors)
+
+
+def Compile(model_id):
+    """Compile models/model_<id>.json into models/compiled_<id>.json."""
+    model_path = ModelRegistry.ModelPath(model_id)
+    with open(model_path, 'r', encoding='utf-8') as file:
+        model = json.load(file)
+
+    # alias와 추출 방식이 같은 스택은 선택자 하나로 합침
+    groups = {}
+    for stack in model["stack_list"]:
+        key = (stack.get("alias", ""), stack["wanted_attr"], bool(stack["is_full_url"]),
+               bool(stack.get("is_non_rec_text", False)))
+        selector = CompileStack(stack)
+        selectors = groups.setdefault(key, [])
+        if selector not in selectors:
+            selectors.append(selector)
+
+    rules = [{"alias": alias, "selector": ", ".join(selectors), "attr": attr,
+              "full_url": full_url, "non_rec_text": non_rec_text}
+             for (alias, attr, full_url, non_rec_text), selectors in groups.items()]
+
+    compiled = {"model_id": model_id, "source_hash": _file_hash(model_path),
+                "stale": False, "rules": rules}
+
+    with open(CompiledPath(model_id), 'w', encoding='utf-8') as file:
+        json.dump(compiled, file, ensure_ascii=False, indent=2)
+    return compiled
+
+
+def CompileAll():
+    compiled = []
+    for path in sorted(glob.glob(f"{ModelRegistry.MODEL_DIR}/model_*.json")):
+        model_id = os.path.basename(path)[len("model_"):-len(".json")]
+        Compile(model_id)
+        compiled.append(model_id)
+    return compiled
+
+
+def _load(model_id):
+    path = CompiledPath(model_id)
+    try:
+        # 컴파일 결과나 원본 모델이 바뀌면 다시 로드
+        mtime = (os.path.getmtime(path), os.path.getmtime(ModelRegistry.ModelPath(model_id)))
+    except FileNotFoundError:
+        return None
+
+    with _lock:
+        cached = _rules.get(model_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as file:
+        compiled = json.load(file)
+
+    # 모델이 다시 학습된 경우 컴파일 결과는 사용하지 않음
+    if compiled["source_hash"] != _file_hash(ModelRegistry.ModelPath(model_id)):
+        compiled["stale"] = True
+
+    # 선택자는 미리 컴파일
+    for rule in compiled["rules"]:
+        rule["compiled"] = soupsieve.compile(rule["selector"])
+
+    with _lock:
+        _rules[model_id] = (mtime, compiled)
+    return compiled
+
+
+def _value(element, rule, url):
+    attr = rule["attr"]
+    if attr is None:
+        if rule["non_rec_text"]:
+            return "".join(element.find_all(string=True, recursive=False)).strip()
+        return element.get_text().strip()
+
+    value = element.attrs.get(attr)
+    if value is None:
+        return None
+    if rule["full_url"]:
+        return urljoin(url, value)
+    return value
+
+
+def Extract(model_id, soup, url):
+    """Apply the compiled rule of model_id to soup.
+
+    Returns {alias: [values]} like get_result_similar(group_by_alias=True),
+    or None when there is no usable compiled rule or it matched nothing.
+    """
+    compiled = _load(model_id)
+    if compiled is None or compiled["stale"]:
+        return None
+
+    result = {}
+    positions = None
+    for rule in compiled["rules"]:
+        elements = rule["compiled"].select(soup)
+        values = [(element, _value(element, rule, url)) for element in elements]
+        result.setdefault(rule["alias"], []).extend((e, v) for e, v in values if v)
+
+    for alias, pairs in result.items():
+        if not pairs:
+            return None
+
+        # 같은 alias에 규칙이 여러개면 문서 순서로 정렬
+        if sum(rule["alias"] == alias for rule in compiled["rules"]) > 1:
+            if positions is None:
+                positions = {id(element): i for i, element in enumerate(soup.find_all(True))}
+            pairs.sort(key=lambda pair: positions[id(pair[0])])
+
+        result[alias] = [value for element, value in pairs]
+
+    return result
+
+
+def MarkStale(model_id):
+    """Flag the compiled rule of model_id so it is skipped until recompiled."""
+    path = CompiledPath(model_id)
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            compiled = json.load(file)
+    except FileNotFoundError:
+        return
+
+    if compiled.get("stale"):
+        return
+
+    compiled["stale"] = True
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(compiled, file, ensure_ascii=False, indent=2)
+    print(f"[CompiledScraper] compiled rule of '{model_id}' is stale, recompile with: python CompiledScraper.py {model_id}")
+
+
+if __name__ == '__main__':
+    import sys
+
+    # 인자가 없으면 전체 모델 컴파일
+    model_ids = sys.argv[1:] or None
+    if model_ids is None:
+        model_ids = CompileAll()
+    else:
+        for model_id in model_ids:
+            Compile(model_id)
+
+    for model_id in model_ids:
+        print(f"compiled : {CompiledPath(model_id)}")
@@ -4,26 +4,275 @@
   - Description      : Fetch Contents from url - each has unique fetch model
   - Owner            : Seokmin.Kang
   - Revision history : 1) 2024.11.22 : Initial release
+                       2) 2026.10.17 : Streaming, size-bounded extraction
+                       3) 2026.10.17 : OCR of image-only notices
+                       4) 2026.10.17 : Text of attached files
 *******************************************************************'''
 
 # -*- coding: utf-8 -*-
-import requests
-from bs4 import BeautifulSoup
+import codecs
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, unquote
 from Errors import FetchError
+import Transport
+import Parser
+import OCR
+import Attachment
+from Summarizer import MAX_CONTENT_CHARS
+
+try:
+    import Hyperparms
+    SUMMARY_EN = Hyperparms.SUMMARY_EN
+except:
+    SUMMARY_EN = True
+
+try:
+    import Hyperparms
+    CONTENT_STREAM_EN = getattr(Hyperparms, "CONTENT_STREAM_EN", True)
+    CONTENT_MAX_BYTES = getattr(Hyperparms, "CONTENT_MAX_BYTES", 2 * 1024 * 1024)
+    CONTENT_MAX_CHARS = getattr(Hyperparms, "CONTENT_MAX_CHARS", MAX_CONTENT_CHARS)
+except:
+    CONTENT_STREAM_EN = True                    # 스트리밍 추출 사용 여부
+    CONTENT_MAX_BYTES = 2 * 1024 * 1024         # 최대 다운로드 크기 (바이트)
+    CONTENT_MAX_CHARS = MAX_CONTENT_CHARS       # 최대 본문 길이 (나눠서 요약 가능한 길이)
+
+CHUNK_SIZE = 16 * 1024
+SKIP_TAGS = {"script", "style", "template", "noscript"}
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+class ContentData:
+    def __init__(self, text, truncated=False, images=None, attachments=None):
+        self.text = text
+        self.truncated = truncated
+        self.images = images or []              # 본문 안 이미지 주소 (OCR 대상)
+        self.attachments = attachments or []    # 본문 안 첨부파일 (주소, 이름)
+
+
+class ContainerExtractor(HTMLParser):
+    """Incrementally collect the stripped strings of the first div matching
+    div_args (same rules as soup.find('div', **div_args))."""
+
+    def __init__(self, div_args, max_chars=CONTENT_MAX_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.div_args = div_args
+        self.max_chars = max_chars
+
+        self.found = False      # 본문 div를 찾았는지
+        self.done = False       # 본문 div가 닫혔거나 글자 수 제한에 도달
+        self.truncated = False
+        self.strings = []
+        self.chars = 0
+        self.images = []
+        self.links = []     # (href, 링크 글자)
+
+        self._link = None
+
+        self._div_depth = 0
+        self._skip_depth = 0
+        self._pending = []
+
+    def _matches(self, attrs):
+        attrs = dict(attrs)
+        for key, value in self.div_args.items():
+            if key in ("class_", "class"):
+                classes = attrs.get("class") or ""
+                if value != classes and value not in classes.split():
+                    return False
+            elif attrs.get(key) != value:
+                return False
+        return True
+
+    def _flush(self):
+        # 태그 경계에서 텍스트 조각을 하나의 문자열로 합침 (stripped_strings와 동일)
+        if not self._pending:
+            return
+        text = "".join(self._pending).strip()
+        self._pending = []
+        if not text:
+            return
+
+        remain = self.max_chars - self.chars
+        if len(text) >= remain:
+            text = text[:max(remain, 0)]
+            self.truncated = True
+            self.done = True
+        if text:
+            self.strings.append(text)
+            self.chars += len(text) + 1
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        self._flush()
+
+        if not self.found:
+            if tag == "div" and self._matches(attrs):
+                self.found = True
+                self._div_depth = 1
+            return
+
+        if tag == "div":
+            self._div_depth += 1
+        elif tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "img":
+            self._image(attrs)
+        elif tag == "a" and not self._skip_depth:
+            href = dict(attrs).get("href")
+            self._link = (href, []) if href else None
+
+    def handle_endtag(self, tag):
+        if self.done or not self.found:
+            return
+        self._flush()
+
+        if tag == "div":
+            self._div_depth -= 1
+            if self._div_depth == 0:
+                self.done = True
+        elif tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "a" and self._link:
+            self.links.append((self._link[0], "".join(self._link[1]).strip()))
+            self._link = None
+
+    def handle_startendtag(self, tag, attrs):
+        if self.found and not self.done:
+            self._flush()
+            if tag == "img":
+                self._image(attrs)
+
+    def _image(self, attrs):
+        # 지연 로딩 이미지는 data-src에 실제 주소가 있음
+        attrs = dict(attrs)
+        src = attrs.get("data-src") or attrs.get("src")
+        if src and not src.startswith("data:") and not self._skip_depth:
+            self.images.append(src)
+
+    def handle_data(self, data):
+        if self.found and not self.done and not self._skip_depth:
+            self._pending.append(data)
+            if self._link:
+                self._link[1].append(data)
+
+    def text(self):
+        self._flush()
+        return "\n".join(self.strings)
+
+
+def _decoder(response, first_chunk):
+    # 헤더에 charset이 없으면 meta 태그에서 확인
+    encoding = response.encoding
+    if encoding is None or (encoding == "ISO-8859-1" and "ISO-8859-1" not in response.headers.get("Content-Type", "")):
+        match = META_CHARSET.search(first_chunk)
+        encoding = match.group(1).decode('ascii') if match else "utf-8"
+
+    try:
+        return codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
 
-def FetchContent(div_args,content_url):
+
+def StreamContent(div_args, content_url, max_bytes=CONTENT_MAX_BYTES, max_chars=CONTENT_MAX_CHARS):
+    """Read the page incrementally and stop as soon as the content div is
+    closed or the byte/char budget is reached."""
+
+    # 1. HTML 요청 (본문 전체를 메모리에 올리지 않음)
+    response = Transport.Get(content_url, stream=True)
+    try:
+        if response.status_code != 200:
+            raise FetchError(f"페이지를 불러오는 데 실패했습니다. 상태 코드: {response.status_code}")
+
+        # 2. 조각 단위로 파싱
+        extractor = ContainerExtractor(div_args, max_chars)
+        decoder = None
+        received = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if decoder is None:
+                decoder = _decoder(response, chunk)
+            received += len(chunk)
+            extractor.feed(decoder.decode(chunk))
+
+            if extractor.done:
+                break
+            # 바이트 제한 도달
+            if received >= max_bytes:
+                extractor.truncated = True
+                break
+    finally:
+        response.close()
+
+    # 3. 본문 추출
+    if not extractor.found:
+        raise FetchError("본문을 찾을 수 없습니다.")
+
+    images = [urljoin(content_url, src) for src in extractor.images]
+    return ContentData(extractor.text(), extractor.truncated, images,
+                       _attachments(content_url, extractor.links))
+
+
+def ExtractContent(div_args, content_url):
+    """Return ContentData (text + truncated flag) of the notice, or None
+    when the dept has no content div.
+
+    When the text is too short (poster-only notice), the text recognized
+    from the images of the content div is appended.
+    """
 
     #Html div 키워드가 지정되지 않은경우
     if div_args is None:
         return
-    
+
+    if CONTENT_STREAM_EN:
+        content_data = StreamContent(div_args, content_url)
+    else:
+        content_data = ParseContent(div_args, content_url)
+
+    # 요약하지 않으면 본문 내용을 쓰지 않으므로 OCR, 첨부파일 추출 생략
+    if not SUMMARY_EN:
+        return content_data
+
+    # 이미지 위주 공지는 OCR 결과를 본문에 추가
+    if content_data.images and OCR.NeedsOcr(content_data.text):
+        ocr_text = OCR.RecognizeImages(content_data.images)
+        if ocr_text:
+            content_data.text = "\n".join(filter(None, [content_data.text, ocr_text]))[:CONTENT_MAX_CHARS]
+
+    # 첨부파일 내용을 본문 뒤에 추가 (요약 입력 제한 이내로)
+    if content_data.attachments:
+        parts = [content_data.text]
+        for name, text in Attachment.ExtractAttachments(content_data.attachments):
+            parts.append(f"[첨부파일 : {name}]\n{text}")
+        text = "\n\n".join(filter(None, parts))
+        if len(text) > CONTENT_MAX_CHARS:
+            content_data.truncated = True
+        content_data.text = text[:CONTENT_MAX_CHARS]
+
+    return content_data
+
+
+def _attachments(content_url, links):
+    # 첨부파일로 보이는 링크만 (이름이 없으면 파일명 사용)
+    attachments = []
+    for href, name in links:
+        if href.startswith(("javascript:", "mailto:", "#")) or not Attachment.IsAttachment(href, name):
+            continue
+        url = urljoin(content_url, href)
+        attachments.append((url, name or unquote(urlsplit(url).path.rsplit("/", 1)[-1])))
+    return attachments
+
+
+def ParseContent(div_args, content_url):
+    """Non-streaming ExtractContent (whole page parsed with Parser)."""
+
     # 1. HTML 요청
-    response = requests.get(content_url)
+    response = Transport.Get(content_url)
     if response.status_code != 200:
         raise FetchError(f"페이지를 불러오는 데 실패했습니다. 상태 코드: {response.status_code}")
     
-    # 2. HTML 파싱
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # 2. HTML 파싱 (lxml 우선, 같은 문서는 한번만 파싱)
+    soup = Parser.Parse(response.text, "content")
     
     # 3. 본문 추출
     content_div = soup.find('div', **div_args)
@@ -33,5 +282,16 @@ def FetchContent(div_args,content_url):
     # 4. 모든 텍스트를 평탄하게 추출
     content = "\n".join(content_div.stripped_strings)
 
-    # 5. 반환
-    return content
\ No newline at end of file
+    # 5. 반환 (요약 입력 제한 이내로 자름)
+    sources = [img.get("data-src") or img.get("src") for img in content_div.find_all("img")]
+    images = [urljoin(content_url, src) for src in sources if src and not src.startswith("data:")]
+    links = [(a["href"], a.get_text().strip()) for a in content_div.find_all("a", href=True)]
+    return ContentData(content[:CONTENT_MAX_CHARS], len(content) > CONTENT_MAX_CHARS, images,
+                       _attachments(content_url, links))
+
+
+def FetchContent(div_args,content_url):
+    content_data = ExtractContent(div_args, content_url)
+    if content_data is None:
+        return
+    return content_data.text
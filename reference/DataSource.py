@@ -0,0 +1,198 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : DataSource.py
+  - Description      : Read notice lists from embedded / API JSON (no browser)
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import json
+import re
+import threading
+
+from requests.exceptions import RequestException
+
+import ListCache
+
+# dept.etc["data_source"] 설정
+#   type       : "embedded" (페이지에 포함된 JSON, 예: Next.js __NEXT_DATA__) / "api" (JSON 응답 주소)
+#   url        : 요청 주소 ({{page}} 치환, 생략시 dept.url)
+#   list_path  : 목록 위치 (예: "props.pageProps.data.content", 생략시 자동 탐색)
+#   title_key  : 제목 키 (생략시 자동 탐색)
+#   url_key    : 링크 키 (생략시 자동 탐색)
+#   url_format : 링크가 없고 id만 있는 경우 링크 형식 (예: "/board/notice/{id}")
+
+TITLE_KEYS = ("title", "subject", "boardTitle", "noticeTitle", "name", "contestName", "ttl")
+URL_KEYS = ("url", "link", "href", "detailUrl", "linkUrl")
+
+EMBEDDED_PATTERN = re.compile(r'<script[^>]+type=["\']application/(?:ld\+)?json["\'][^>]*>(.*?)</script>', re.S | re.I)
+NEXT_DATA_PATTERN = re.compile(r'<script[^>]+id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I)
+
+_lock = threading.Lock()
+_stats = {"ok": 0, "fallback": 0}
+
+
+def _count(key):
+    with _lock:
+        _stats[key] += 1
+
+
+def Stats():
+    with _lock:
+        stats = dict(_stats)
+    total = stats["ok"] + stats["fallback"]
+    stats["ok_rate"] = stats["ok"] / total if total else 0.0
+    return stats
+
+
+def _documents(html):
+    # __NEXT_DATA__를 우선, 그 외 JSON script 태그 순서로
+    scripts = NEXT_DATA_PATTERN.findall(html) + EMBEDDED_PATTERN.findall(html)
+    for script in scripts:
+        try:
+            yield json.loads(script)
+        except json.JSONDecodeError:
+            continue
+
+
+def _get_path(data, path):
+    for key in path.split("."):
+        data = data[int(key)] if isinstance(data, list) else data[key]
+    return data
+
+
+def _key(item, config_key, candidates):
+    if config_key:
+        return config_key if config_key in item else None
+    return next((key for key in candidates if isinstance(item.get(key), str) and item[key].strip()), None)
+
+
+def _is_notice_list(value, config):
+    if not isinstance(value, list) or not value or not all(isinstance(item, dict) for item in value):
+        return False
+    first = value[0]
+    if _key(first, config.get("title_key"), TITLE_KEYS) is None:
+        return False
+    return bool(config.get("url_format")) or _key(first, config.get("url_key"), URL_KEYS) is not None
+
+
+def _find_list(data, config):
+    """Longest list of dicts that has a title key and a link (or url_format)."""
+    best = None
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if _is_notice_list(value, config):
+            if best is None or len(value) > len(best):
+                best = value
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return best
+
+
+def _map(items, config, url_prefix):
+    title_key = _key(items[0], config.get("title_key"), TITLE_KEYS)
+    url_key = None if config.get("url_format") else _key(items[0], config.get("url_key"), URL_KEYS)
+
+    titles = []
+    urls = []
+    for item in items:
+        title = item.get(title_key)
+        if config.get("url_format"):
+            try:
+                url = config["url_format"].format(**item)
+            except (KeyError, IndexError):
+                continue
+        else:
+            url = item.get(url_key)
+        if not title or not url:
+            continue
+
+        # 학과 url_prefix는 Overview에서 붙이므로 제거
+        if url_prefix and url.startswith(url_prefix):
+            url = url[len(url_prefix):]
+        titles.append(str(title).strip())
+        urls.append(str(url).strip())
+
+    return {"title": titles, "url": urls}
+
+
+def Extract(dept, text):
+    """Map the JSON data of a fetched page (or API response) to
+    {"title": [...], "url": [...]}; empty lists when nothing matches.
+    """
+    config = dept.etc["data_source"]
+
+    # 1. JSON 문서 구하기
+    if config.get("type", "embedded") == "api":
+        documents = [json.loads(text)]
+    else:
+        documents = _documents(text)
+
+    # 2. 목록 찾기 (지정된 위치 또는 자동 탐색)
+    items = None
+    for data in documents:
+        if config.get("list_path"):
+            try:
+                items = _get_path(data, config["list_path"])
+            except (KeyError, IndexError, TypeError, ValueError):
+                continue
+        else:
+            items = _find_list(data, config)
+        if items:
+            break
+
+    # 3. 제목/링크로 변환
+    if not items:
+        return {"title": [], "url": []}
+    return _map(items, config, dept.etc.get("url_prefix", ""))
+
+
+def Fetch(dept, page=1):
+    """Return {"title": [...], "url": [...]} read from the JSON data source of
+    dept, or None when it is not configured or yields nothing (the caller
+    falls back to the browser).
+
+    The request goes through ListCache, so an unchanged list costs a
+    conditional GET and no JSON parsing.
+    """
+    config = dept.etc.get("data_source")
+    if not config:
+        return None
+
+    url = config.get("url", dept.url).replace("{{page}}", str(page))
+
+    # 설정이 바뀌면 캐시된 결과 무효화
+    source_key = "data_source:" + json.dumps(config, sort_keys=True)
+
+    try:
+        result = ListCache.Scrape(url, source_key, lambda url, html: Extract(dept, html))
+    except (RequestException, ValueError) as e:
+        print(f"[DataSource] {dept.dept_id} : {e}")
+        result = None
+
+    if not result or not result["title"]:
+        _count("fallback")
+        return None
+
+    _count("ok")
+    return result
+
+
+if __name__ == '__main__':
+    import sys
+    import DeptInfo
+
+    # python DataSource.py startup : 데이터 소스 결과 확인
+    # (설정이 없는 학과는 embedded로 시험, 설정 전에 JSON 구조 확인용)
+    dept = getattr(DeptInfo, sys.argv[1] if len(sys.argv) > 1 else "startup")
+    dept.etc.setdefault("data_source", {"type": "embedded"})
+    result = Fetch(dept)
+    if result is None:
+        print("no data (falls back to the browser)")
+    else:
+        for title, url in zip(result["title"], result["url"]):
+            print(f"{title} : {url}")
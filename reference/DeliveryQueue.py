@@ -0,0 +1,227 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : DeliveryQueue.py
+  - Description      : Rate-limit aware background Discord delivery
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import queue
+import threading
+import time
+
+import DiscordMsg
+from Errors import DiscordError
+
+MAX_ATTEMPTS = 5        # 429 응답시 최대 재시도 횟수
+MAX_RETRY_AFTER = 60    # 한번에 기다릴 최대 시간 (초)
+
+try:
+    import Hyperparms
+    COALESCE_EN = getattr(Hyperparms, "COALESCE_EN", True)
+    COALESCE_WINDOW = getattr(Hyperparms, "COALESCE_WINDOW", 0.5)
+except:
+    COALESCE_EN = True      # 같은 채널의 임베드를 메시지 하나로 묶어 전송
+    COALESCE_WINDOW = 0.5   # 묶을 임베드를 기다리는 시간 (초)
+
+
+class DeliveryItem:
+    def __init__(self, channel_id, data, on_delivered=None, tag=None):
+        self.channel_id = channel_id
+        self.data = data
+        self.on_delivered = on_delivered
+        self.tag = tag
+
+    def is_single_embed(self):
+        return set(self.data) == {"embeds"} and len(self.data["embeds"]) == 1
+
+
+class RateLimiter:
+    """Track Discord per-route (per channel) and global rate limits."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._global_until = 0.0
+        self._route_until = {}
+
+    def wait(self, channel_id):
+        while True:
+            with self._lock:
+                until = max(self._global_until, self._route_until.get(channel_id, 0.0))
+            delay = until - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def update(self, channel_id, response):
+        headers = response.headers
+        now = time.monotonic()
+
+        with self._lock:
+            # 1. 남은 요청 수가 0이면 리셋 시각까지 해당 채널 대기
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset_after = headers.get("X-RateLimit-Reset-After")
+            if remaining is not None and reset_after is not None and int(remaining) == 0:
+                self._route_until[channel_id] = now + min(float(reset_after), MAX_RETRY_AFTER)
+
+            # 2. 429 응답시 Retry-After 만큼 대기 (global이면 모든 채널 대기)
+            if response.status_code == 429:
+                retry_after = headers.get("Retry-After")
+                is_global = headers.get("X-RateLimit-Global", "").lower() == "true"
+                try:
+                    body = response.json()
+                    retry_after = body.get("retry_after", retry_after)
+                    is_global = is_global or body.get("global", False)
+                except ValueError:
+                    pass
+
+                until = now + min(float(retry_after or 1), MAX_RETRY_AFTER)
+                if is_global:
+                    self._global_until = max(self._global_until, until)
+                else:
+                    self._route_until[channel_id] = max(self._route_until.get(channel_id, 0.0), until)
+
+
+class ChannelWorker(threading.Thread):
+    """Deliver the messages of one channel in order."""
+
+    def __init__(self, channel_id, owner):
+        super().__init__(name=f"discord-{channel_id}", daemon=True)
+        self.channel_id = channel_id
+        self.owner = owner
+        self.queue = queue.Queue()
+        self._leftover = None
+
+    def _next_batch(self):
+        # 첫 항목을 받은 뒤 잠시 기다리며 같은 채널의 임베드를 모음
+        first = self._leftover or self.queue.get()
+        self._leftover = None
+        batch = [first]
+        if not COALESCE_EN or not first.is_single_embed():
+            return batch
+
+        deadline = time.monotonic() + COALESCE_WINDOW
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            # 묶을 수 없는 메시지는 순서를 지키기 위해 다음 차례로 넘김
+            if not item.is_single_embed():
+                self._leftover = item
+                break
+            batch.append(item)
+        return batch
+
+    def _coalesce(self, batch):
+        # 임베드 수, 글자 수 제한 안에서 메시지 수가 최소가 되도록 묶음
+        if len(batch) == 1:
+            return [(batch[0], batch)]
+
+        embeds = [item.data["embeds"][0] for item in batch]
+        merged = []
+        start = 0
+        for group in DiscordMsg.PackEmbeds(embeds):
+            items = batch[start:start + len(group)]
+            start += len(group)
+            callbacks = [item.on_delivered for item in items if item.on_delivered is not None]
+            merged.append((DeliveryItem(self.channel_id, {"embeds": group},
+                                        lambda callbacks=callbacks: [callback() for callback in callbacks]),
+                           items))
+        return merged
+
+    def _deliver_each(self, items):
+        for item in items:
+            try:
+                self.owner.deliver(item)
+            except Exception as e:
+                self.owner.record_error(item.tag, e)
+
+    def run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                for message, items in self._coalesce(batch):
+                    try:
+                        self.owner.deliver(message)
+                    except Exception as e:
+                        # 묶은 메시지가 거부되면 (429 이외의 4xx) 잘못된 임베드만 실패하도록 하나씩 다시 전송
+                        if len(items) > 1 and 400 <= getattr(e, "status_code", 0) < 500:
+                            self._deliver_each(items)
+                            continue
+                        for tag in {id(item.tag): item.tag for item in items}.values():
+                            self.owner.record_error(tag, e)
+            finally:
+                for item in batch:
+                    self.queue.task_done()
+
+
+class DeliveryQueue:
+    def __init__(self):
+        self.limiter = RateLimiter()
+        self._lock = threading.Lock()
+        self._workers = {}
+        self._errors = []
+
+    def enqueue(self, item):
+        # 채널별로 전용 스레드를 두어 채널 간에는 동시에, 채널 내에서는 순서대로 전송
+        with self._lock:
+            worker = self._workers.get(item.channel_id)
+            if worker is None:
+                worker = ChannelWorker(item.channel_id, self)
+                self._workers[item.channel_id] = worker
+                worker.start()
+        worker.queue.put(item)
+
+    def deliver(self, item):
+        for attempt in range(MAX_ATTEMPTS):
+            self.limiter.wait(item.channel_id)
+            response = DiscordMsg.PostMessage(item.channel_id, item.data)
+            self.limiter.update(item.channel_id, response)
+
+            if response.status_code == 200 or response.status_code == 201:
+                if item.on_delivered is not None:
+                    item.on_delivered()
+                return response.json()
+
+            # 429 이외의 오류는 재시도하지 않음
+            if response.status_code != 429:
+                break
+
+        error = DiscordError(f"메시지 전송 실패: {response.status_code}, {response.text}")
+        error.status_code = response.status_code
+        raise error
+
+    def record_error(self, tag, error):
+        with self._lock:
+            self._errors.append((tag, error))
+
+    def join(self):
+        """Wait until every queued message is sent; return and reset the
+        (tag, exception) list of failed deliveries."""
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.queue.join()
+
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+
+_delivery_queue = DeliveryQueue()
+
+
+def Enqueue(channel_id, data, on_delivered=None, tag=None):
+    _delivery_queue.enqueue(DeliveryItem(channel_id, data, on_delivered, tag))
+
+
+def EnqueueNotice(notice_data, on_delivered=None, tag=None):
+    """Queue the embed message of notice_data; returns immediately."""
+    channel_id, embed = DiscordMsg.BuildEmbedMessage(notice_data)
+    Enqueue(channel_id, {"embeds": [embed]}, on_delivered, tag)
+
+
+def Join():
+    return _delivery_queue.join()
@@ -22,50 +22,34 @@ class dept_info:
 
     def build_htmlpage(self,url):
 
-        from selenium import webdriver
         from selenium.webdriver.common.by import By
         from selenium.webdriver.support.ui import WebDriverWait
         from selenium.webdriver.support import expected_conditions as EC
-        from selenium.webdriver.firefox.service import Service
-        from selenium.webdriver.firefox.options import Options
-        
+        import BrowserPool
+
         try:
             import Hyperparms
             DEBUG_EN = Hyperparms.DEBUG_EN
         except:
             DEBUG_EN = False
 
-        if DEBUG_EN:
-            # Chrome 사용
-            driver = webdriver.Chrome()
-        else:
-            # Firefox 옵션 설정 (headless 예시 포함)
-            options = Options()
-            options.add_argument('--headless')
+        # 풀에서 미리 띄워둔 브라우저를 빌려서 사용
+        with BrowserPool.Acquire() as driver:
 
-            # Firefox 실행 파일 위치 지정
-            options.binary_location = "/usr/bin/firefox"
-            # geckodriver 서비스 설정
-            service = Service(executable_path="/usr/local/bin/geckodriver")
-            # 웹드라이버 객체 생성
-            driver = webdriver.Firefox(service=service, options=options)
+            driver.get(url)
 
-        driver.get(url)
+            # 제목 링크가 로딩될 때까지 대기
+            try:
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.css_sel))
+                )
+            finally:
+                html = driver.page_source
+
+                if DEBUG_EN:
+                    with open("dev/fetched_selenium.html", "w", encoding="utf-8") as f:
+                        f.write(html)
 
-        # 제목 링크가 로딩될 때까지 대기
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.css_sel))
-            )
-        finally:
-            html = driver.page_source
-
-            if DEBUG_EN:
-                with open("dev/fetched_selenium.html", "w", encoding="utf-8") as f:
-                    f.write(html)
-
-            driver.quit()
-        
         return html
     
     def build_source(self,page=1):
@@ -7,15 +7,17 @@
                         2) 2025.04.12 : Updated footer Icon display feature
 *******************************************************************'''
 
-import requests
 import json
-import os
 from datetime import datetime, timezone
 from Errors import DiscordError
+import Transport
+import Secrets
 
 # 디스코드 설정
 BOT_TOKEN_FILE = 'secrets/discord-api-info.json'
 CHANNEL_ID_DEBUG = "1355610759777882162"
+MAX_EMBEDS_PER_MESSAGE = 10        # 메시지 하나에 담을 수 있는 최대 임베드 수
+MAX_EMBED_CHARS_PER_MESSAGE = 6000  # 메시지 하나의 임베드 전체 글자 수 제한
 ICON_DEBUG = "https://cdn.discordapp.com/attachments/1355611235156234473/1360547635672649869/c7dca22d3f65a53a.png?ex=67fb843a&is=67fa32ba&hm=f33da564c49964ab9ef2ce280a651dc9f968926d70be675db62f4fd8af4332fb&"
 
 try:
@@ -25,36 +27,26 @@ except:
     DEBUG_EN = False
 
 def LoadSecrets(file_path):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Configuration file not found: {file_path}")
+    # 파일이 바뀐 경우에만 다시 읽음
+    return Secrets.Load(file_path, {'bot_token'})
 
-    with open(file_path, 'r', encoding='utf-8') as file:
-        try:
-            api_info = json.load(file)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON format in {file_path}: {e}")
 
-    required_keys = {'bot_token'}
-    if not required_keys.issubset(api_info.keys()):
-        raise ValueError(f"Missing required keys in JSON file: {required_keys - api_info.keys()}")
-
-    return api_info
+# 인증 헤더 (봇 토큰 파일이 바뀐 경우에만 다시 생성, 수정하지 말 것)
+def GetHeaders():
+    return Secrets.Derived(BOT_TOKEN_FILE, "headers", lambda api_info: {
+        "Authorization": f"Bot {api_info['bot_token']}",
+        "Content-Type": "application/json",
+    }, {'bot_token'})
 
 
 # 내용 메시지 전송 함수
 def SendContentMessage(content):
 
-    api_info = LoadSecrets(BOT_TOKEN_FILE)
-    bot_token=api_info['bot_token']
-
-    headers = {
-        "Authorization": f"Bot {bot_token}",
-        "Content-Type": "application/json",
-    }
+    headers = GetHeaders()
     data = {"content": content}
 
     discord_api_url = f"https://discord.com/api/v10/channels/{CHANNEL_ID_DEBUG}/messages"
-    response = requests.post(discord_api_url, headers=headers, data=json.dumps(data))
+    response = Transport.Post(discord_api_url, headers=headers, data=json.dumps(data))
 
     if response.status_code == 200 or response.status_code == 201:
         return response.json()
@@ -65,17 +57,11 @@ def SendContentMessage(content):
 def SendCustomMessage(embed, channel_id):
     #메시지 구성요소
 
-    api_info = LoadSecrets(BOT_TOKEN_FILE)
-    bot_token=api_info['bot_token']
-
     data = {"embeds": [embed]}
-    headers = {
-        "Authorization": f"Bot {bot_token}",
-        "Content-Type": "application/json",
-    }
+    headers = GetHeaders()
 
     discord_api_url = f"https://discord.com/api/v10/channels/{channel_id}/messages"
-    response = requests.post(discord_api_url, headers=headers, data=json.dumps(data))
+    response = Transport.Post(discord_api_url, headers=headers, data=json.dumps(data))
     
     if response.status_code == 200 or response.status_code == 201:
         return response.json()
@@ -97,17 +83,11 @@ def SendDebugMessage(content):
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
-    api_info = LoadSecrets(BOT_TOKEN_FILE)
-    bot_token=api_info['bot_token']
-
     data = {"embeds": [embed]}
-    headers = {
-        "Authorization": f"Bot {bot_token}",
-        "Content-Type": "application/json",
-    }
+    headers = GetHeaders()
 
     discord_api_url = f"https://discord.com/api/v10/channels/{CHANNEL_ID_DEBUG}/messages"
-    response = requests.post(discord_api_url, headers=headers, data=json.dumps(data))
+    response = Transport.Post(discord_api_url, headers=headers, data=json.dumps(data))
 
     if response.status_code == 200 or response.status_code == 201:
         return response.json()
@@ -115,8 +95,8 @@ def SendDebugMessage(content):
         raise DiscordError(f"메시지 전송 실패: {response.status_code}, {response.text}")
 
 
-# 임베드 메시지 전송 함수
-def SendEmbedMessage(notice_data):
+# 공지 임베드 메시지 구성 함수 (채널 ID, 임베드 반환)
+def BuildEmbedMessage(notice_data):
     #메시지 구성요소
     dept= notice_data.dept
     title= notice_data.title
@@ -147,17 +127,49 @@ def SendEmbedMessage(notice_data):
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
-    api_info = LoadSecrets(BOT_TOKEN_FILE)
-    bot_token=api_info['bot_token']
+    return channel_id, embed
 
-    data = {"embeds": [embed]}
-    headers = {
-        "Authorization": f"Bot {bot_token}",
-        "Content-Type": "application/json",
-    }
+
+# 메시지 전송 요청 함수 (응답 상태 확인은 호출측에서 처리)
+def PostMessage(channel_id, data):
+
+    headers = GetHeaders()
 
     discord_api_url = f"https://discord.com/api/v10/channels/{channel_id}/messages"
-    response = requests.post(discord_api_url, headers=headers, data=json.dumps(data))
+    return Transport.Post(discord_api_url, headers=headers, data=json.dumps(data))
+
+
+# 임베드 글자 수 (디스코드 제한 기준: 제목, 설명, 필드, 푸터, 작성자)
+def EmbedLength(embed):
+    length = len(embed.get("title", "")) + len(embed.get("description", ""))
+    for field in embed.get("fields", []):
+        length += len(field.get("name", "")) + len(field.get("value", ""))
+    length += len(embed.get("footer", {}).get("text", ""))
+    length += len(embed.get("author", {}).get("name", ""))
+    return length
+
+
+# 임베드 묶기 함수 (순서를 유지하며 메시지 수가 최소가 되도록 그룹화)
+def PackEmbeds(embeds):
+    groups = []
+    group, group_chars = [], 0
+    for embed in embeds:
+        length = EmbedLength(embed)
+        if group and (len(group) >= MAX_EMBEDS_PER_MESSAGE or group_chars + length > MAX_EMBED_CHARS_PER_MESSAGE):
+            groups.append(group)
+            group, group_chars = [], 0
+        group.append(embed)
+        group_chars += length
+    if group:
+        groups.append(group)
+    return groups
+
+
+# 임베드 메시지 전송 함수
+def SendEmbedMessage(notice_data):
+
+    channel_id, embed = BuildEmbedMessage(notice_data)
+    response = PostMessage(channel_id, {"embeds": [embed]})
     
     if response.status_code == 200 or response.status_code == 201:
         return response.json()
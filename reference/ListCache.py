@@ -0,0 +1,137 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : ListCache.py
+  - Description      : Skip re-parsing notice list pages that did not change
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import threading
+
+import Transport
+
+CACHE_FILE = "buffers/list_cache.json"
+
+_lock = threading.Lock()
+_entries = None
+_stats = {"requests": 0, "not_modified": 0, "same_hash": 0, "parsed": 0}
+
+
+def _load():
+    global _entries
+    if _entries is not None:
+        return _entries
+
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as file:
+            _entries = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        _entries = {}
+
+    # 주소만으로 저장하던 이전 형식의 항목 제거
+    _entries = {key: entry for key, entry in _entries.items() if "|" in key}
+    return _entries
+
+
+def _cache_key(url, model_key):
+    # 같은 주소라도 읽는 방식(모델, 데이터 소스)별로 따로 저장하여 서로 밀어내지 않도록 함
+    # (model_key의 ":" 앞부분, 모델이 바뀌면 같은 자리를 덮어씀)
+    return model_key.split(":", 1)[0] + "|" + url
+
+
+def _save():
+    #부모 디렉터리 없으면 생성
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+
+    # 중간에 종료되어도 파일이 깨지지 않도록 임시파일에 쓰고 교체
+    tmp_path = CACHE_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(_entries, file, ensure_ascii=False)
+    os.replace(tmp_path, CACHE_FILE)
+
+
+def _count(key):
+    with _lock:
+        _stats[key] += 1
+
+
+def Stats():
+    """Return short-circuit counters of the current process."""
+    with _lock:
+        stats = dict(_stats)
+    hits = stats["not_modified"] + stats["same_hash"]
+    stats["hit_rate"] = hits / stats["requests"] if stats["requests"] else 0.0
+    return stats
+
+
+def Scrape(url, model_key, scrape, html=None):
+    """Return scrape(url=..., html=...) for a list page, reusing the cached
+    result when the page is unchanged.
+
+    If html is None the page is fetched with a conditional GET
+    (If-None-Match / If-Modified-Since). A 304 response or a body with the
+    same hash as last time skips scrape entirely. model_key identifies the
+    scraping model so a retrained model invalidates the cached result;
+    entries are kept per source ("<model_id>:..." or "data_source:..."), so
+    the data-source path and the browser path of one page do not evict
+    each other.
+    """
+    cache_key = _cache_key(url, model_key)
+    with _lock:
+        entry = _load().get(cache_key)
+    if entry is not None and entry.get("model_key") != model_key:
+        entry = None
+
+    _count("requests")
+    etag = last_modified = None
+
+    # 1. 조건부 요청 (html을 직접 받은 경우 생략)
+    if html is None:
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = Transport.Get(url, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            _count("not_modified")
+            return entry["result"]
+
+        # autoscraper와 동일한 인코딩 보정
+        if response.encoding == "ISO-8859-1" and "ISO-8859-1" not in response.headers.get("Content-Type", ""):
+            response.encoding = response.apparent_encoding
+
+        html = response.text
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+    # 2. 본문 해시 비교
+    body_hash = hashlib.sha256(html.encode('utf-8')).hexdigest()
+    if entry is not None and entry.get("hash") == body_hash:
+        _count("same_hash")
+        return entry["result"]
+
+    # 3. 변경된 경우에만 파싱
+    _count("parsed")
+    result = scrape(url=url, html=html)
+
+    # 빈 결과는 저장하지 않음 (다음 실행시 다시 파싱)
+    if result.get("title") and result.get("url"):
+        with _lock:
+            _load()[cache_key] = {
+                "model_key": model_key,
+                "etag": etag,
+                "last_modified": last_modified,
+                "hash": body_hash,
+                "result": result,
+            }
+            _save()
+
+    return result
@@ -0,0 +1,218 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : LocalSummary.py
+  - Description      : Summary announcement contents with a local LLM
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import json
+import queue
+import re
+import threading
+from concurrent.futures import Future
+
+from requests.exceptions import RequestException
+
+from Errors import SummaryError
+import Transport
+import SummaryCache
+
+try:
+    import Hyperparms
+    OLLAMA_HOST = getattr(Hyperparms, "OLLAMA_HOST", "http://localhost:11434")
+    LOCAL_MODEL = getattr(Hyperparms, "LOCAL_MODEL", "qwen3:8b")
+    LOCAL_WORKERS = getattr(Hyperparms, "LOCAL_WORKERS", 2)
+    LOCAL_QUEUE_SIZE = getattr(Hyperparms, "LOCAL_QUEUE_SIZE", 16)
+    LOCAL_NUM_CTX = getattr(Hyperparms, "LOCAL_NUM_CTX", 8192)
+    LOCAL_KEEP_ALIVE = getattr(Hyperparms, "LOCAL_KEEP_ALIVE", "30m")
+except:
+    OLLAMA_HOST = "http://localhost:11434"  # Ollama 호환 서버 주소
+    LOCAL_MODEL = "qwen3:8b"                # 요약 모델
+    LOCAL_WORKERS = 2                       # 동시 요청 수 (서버의 OLLAMA_NUM_PARALLEL 이하)
+    LOCAL_QUEUE_SIZE = 16                   # 대기 가능한 요약 작업 수 (가득 차면 제출이 대기)
+    LOCAL_NUM_CTX = 8192                    # 컨텍스트 길이 (토큰)
+    LOCAL_KEEP_ALIVE = "30m"                # 마지막 요청 후 모델을 메모리에 유지할 시간
+
+SUMMARY_TIMEOUT = (Transport.CONNECT_TIMEOUT, 300)  # 로컬 모델은 응답이 느릴 수 있음
+MAX_INPUT_CHARS = 12000  # 컨텍스트에 들어가는 최대 글자 수 (한국어 약 1.5자/토큰 기준)
+
+# 모든 요청이 같은 접두부(시스템 프롬프트)로 시작해야 서버가 KV 캐시를 재사용함
+# 요청별로 달라지는 내용은 반드시 이 뒤(user 메시지)에만 넣을 것
+SYSTEM_PROMPT = ("당신은 대학 공지사항을 요약하는 도우미입니다.\n"
+                 "- 한국어로 3~5문장 이내로 요약합니다.\n"
+                 "- 일정, 대상, 신청 방법, 문의처가 있으면 반드시 포함합니다.\n"
+                 "- 원문에 없는 내용은 만들지 않습니다.\n"
+                 "- 요약문만 출력합니다.")
+
+# 모델 재로드를 막기 위해 옵션도 요청마다 동일하게 유지
+OPTIONS = {"temperature": 0, "num_ctx": LOCAL_NUM_CTX}
+
+THINK_PATTERN = re.compile(r"<think>.*?</think>", re.S)
+
+
+def CacheNamespace():
+    # 모델이 바뀌면 이전 요약은 재사용하지 않음
+    return f"ollama:{LOCAL_MODEL}"
+
+
+def _RequestSummary(content):
+    request_data = {
+        "model": LOCAL_MODEL,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": content},
+        ],
+        "stream": False,
+        "think": False,
+        "keep_alive": LOCAL_KEEP_ALIVE,
+        "options": OPTIONS,
+    }
+
+    try:
+        response = Transport.Post(f"{OLLAMA_HOST}/api/chat", data=json.dumps(request_data),
+                                  headers={'Content-Type': 'application/json'}, timeout=SUMMARY_TIMEOUT)
+    except RequestException as e:
+        raise SummaryError(f"Local LLM request failed : {e}")
+    if response.status_code != 200:
+        raise SummaryError(f"Local LLM error {response.status_code} : {response.text[:200]}")
+
+    result = response.json()
+    summary = THINK_PATTERN.sub("", result.get("message", {}).get("content", "")).strip()
+    if not summary:
+        raise SummaryError("Local LLM returned an empty summary")
+
+    SummaryCache.Put(content, summary, CacheNamespace())
+    return summary
+
+
+class WorkQueue:
+    """Bounded queue served by a fixed number of workers.
+
+    The worker count is the request concurrency sent to the server; once
+    LOCAL_QUEUE_SIZE jobs are waiting, submit() blocks the producer.
+    """
+    def __init__(self, workers=LOCAL_WORKERS, size=LOCAL_QUEUE_SIZE):
+        self.workers = max(1, workers)
+        self._jobs = queue.Queue(maxsize=size)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"summary-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            content, future = self._jobs.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(_RequestSummary(content))
+                except Exception as e:
+                    future.set_exception(e)
+            self._jobs.task_done()
+
+    def submit(self, content):
+        self._start()
+        future = Future()
+        self._jobs.put((content, future))
+        return future
+
+
+_work_queue = WorkQueue()
+
+
+def Summarize(content):
+    """Summarize the given content with the local LLM."""
+    # 이미 요약한 내용이면 요청 생략
+    summary = SummaryCache.Get(content, CacheNamespace())
+    if summary is not None:
+        return summary
+
+    return _work_queue.submit(content).result()
+
+
+def SummarizeMany(contents):
+    """Summarize several contents; failed items are None (see ClovaSummary)."""
+    unique_contents = list(dict.fromkeys(contents))
+    results = {}
+    futures = {}
+
+    for content in unique_contents:
+        summary = SummaryCache.Get(content, CacheNamespace())
+        if summary is not None:
+            results[content] = summary
+        else:
+            futures[content] = _work_queue.submit(content)
+
+    for content, future in futures.items():
+        try:
+            results[content] = future.result()
+        except SummaryError:
+            results[content] = None
+
+    return [results[content] for content in contents]
+
+
+def StubServer(port=11434):
+    """Minimal Ollama-compatible /api/chat server for local testing.
+
+    Answers with the first sentence of the user message and counts the
+    requests that reused the system prompt prefix.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            if self.path != "/api/chat":
+                self.send_error(404)
+                return
+
+            messages = body["messages"]
+            server.requests += 1
+            if messages[0]["content"] == server.last_prefix:
+                server.prefix_hits += 1
+            server.last_prefix = messages[0]["content"]
+
+            text = messages[-1]["content"].strip()
+            summary = re.split(r"(?<=[.!?다])\s", text, maxsplit=1)[0]
+            data = json.dumps({"model": body["model"], "done": True,
+                               "message": {"role": "assistant", "content": f"<think></think>{summary}"}})
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data.encode('utf-8'))))
+            self.end_headers()
+            self.wfile.write(data.encode('utf-8'))
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.requests = 0
+    server.prefix_hits = 0
+    server.last_prefix = None
+    return server
+
+
+if __name__ == '__main__':
+    import sys
+
+    # python LocalSummary.py stub : 테스트용 서버 실행
+    if sys.argv[1:] == ["stub"]:
+        from urllib.parse import urlparse
+        print(f"stub server on {OLLAMA_HOST}")
+        StubServer(urlparse(OLLAMA_HOST).port or 11434).serve_forever()
+
+    # Example content to summarize
+    example_content = "Here is a lengthy text that needs to be summarized."
+
+    summary = Summarize(example_content)
+    print("Summary:", summary)
@@ -0,0 +1,59 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : ModelRegistry.py
+  - Description      : Load each AutoScraper model once and share it
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import glob
+import os
+import threading
+
+from autoscraper import AutoScraper
+
+MODEL_DIR = "models"
+
+_lock = threading.Lock()
+_models = {}  # model_id -> (mtime, scraper)
+
+
+def ModelId(dept_id):
+    """disu, disu_polaris -> disu (학과 변형은 같은 모델을 공유)"""
+    return dept_id.split('_')[0]
+
+
+def ModelPath(model_id):
+    return f"{MODEL_DIR}/model_{model_id}.json"
+
+
+def Get(model_id):
+    """Return (scraper, model_key) for model_id.
+
+    The model file is loaded on first use and reloaded only when its mtime
+    changes. model_key changes with the file and can be used to invalidate
+    results derived from the model. The returned scraper is shared and must
+    be used read-only (get_result_similar).
+    """
+    path = ModelPath(model_id)
+    mtime = os.path.getmtime(path)
+
+    with _lock:
+        cached = _models.get(model_id)
+        if cached is None or cached[0] != mtime:
+            scraper = AutoScraper()
+            scraper.load(path)
+            cached = (mtime, scraper)
+            _models[model_id] = cached
+
+    return cached[1], f"{model_id}:{mtime}"
+
+
+def Preload():
+    """Load every models/model_*.json up front (e.g. at service startup)."""
+    for path in sorted(glob.glob(f"{MODEL_DIR}/model_*.json")):
+        model_id = os.path.basename(path)[len("model_"):-len(".json")]
+        Get(model_id)
+    with _lock:
+        return sorted(_models)
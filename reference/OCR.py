@@ -0,0 +1,196 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : OCR.py
+  - Description      : Recognize text of image-only notices (Tesseract)
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import io
+import time
+
+from requests.exceptions import RequestException
+
+import Transport
+import Worker
+
+# Pillow, pytesseract가 없으면 OCR 단계 생략
+try:
+    from PIL import Image
+    import pytesseract
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+try:
+    import Hyperparms
+    OCR_EN = getattr(Hyperparms, "OCR_EN", True)
+    OCR_LANG = getattr(Hyperparms, "OCR_LANG", "kor+eng")
+    OCR_WORKERS = getattr(Hyperparms, "OCR_WORKERS", 2)
+    OCR_MIN_TEXT_CHARS = getattr(Hyperparms, "OCR_MIN_TEXT_CHARS", 200)
+    OCR_MAX_IMAGES = getattr(Hyperparms, "OCR_MAX_IMAGES", 5)
+    OCR_MAX_BYTES = getattr(Hyperparms, "OCR_MAX_BYTES", 5 * 1024 * 1024)
+    OCR_MAX_PIXELS = getattr(Hyperparms, "OCR_MAX_PIXELS", 25_000_000)
+    OCR_TIMEOUT = getattr(Hyperparms, "OCR_TIMEOUT", 30)
+except:
+    OCR_EN = True                       # OCR 사용 여부
+    OCR_LANG = "kor+eng"                # tesseract 언어
+    OCR_WORKERS = 2                     # 동시에 실행할 OCR 프로세스 수
+    OCR_MIN_TEXT_CHARS = 200            # 본문이 이보다 짧을 때만 이미지 OCR (이미지 위주 공지)
+    OCR_MAX_IMAGES = 5                  # 공지 하나당 최대 이미지 수
+    OCR_MAX_BYTES = 5 * 1024 * 1024     # 이미지 하나당 최대 다운로드 크기 (바이트)
+    OCR_MAX_PIXELS = 25_000_000         # 이미지 하나당 최대 픽셀 수 (가로 x 세로)
+    OCR_TIMEOUT = 30                    # 이미지 하나당 최대 OCR 시간 (초, OCR 시작부터)
+
+CACHE_FILE = "buffers/ocr_cache.db"
+HASH_DISTANCE = 4  # 같은 이미지로 볼 최대 해시 차이 (64비트 중, 재압축/크기 변경 허용)
+CHUNK_SIZE = 64 * 1024
+
+_runner = Worker.Runner(OCR_WORKERS)
+_cache = Worker.Cache(CACHE_FILE, """CREATE TABLE IF NOT EXISTS ocr (
+                                        hash INTEGER PRIMARY KEY,
+                                        text TEXT NOT NULL,
+                                        created_at REAL NOT NULL)""")
+_stats = Worker.Counters(images=0, skipped=0, cache_hits=0, recognized=0, failed=0, seconds=0.0)
+_count = _stats.count
+
+
+def Stats():
+    return _stats.snapshot()
+
+
+def _to_signed(value):
+    # sqlite INTEGER는 부호 있는 64비트
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def DHash(image):
+    """64-bit difference hash; stays the same when a poster is resized or recompressed."""
+    pixels = list(image.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+def _lookup(image_hash):
+    with _cache.connect() as conn:
+        row = conn.execute("SELECT text FROM ocr WHERE hash = ?", (_to_signed(image_hash),)).fetchone()
+        if row is not None:
+            return row[0]
+
+        # 해시가 조금 다른 같은 이미지 (캐시는 공지 이미지 수 만큼이라 전체 비교)
+        for stored, text in conn.execute("SELECT hash, text FROM ocr"):
+            if bin((stored & ((1 << 64) - 1)) ^ image_hash).count("1") <= HASH_DISTANCE:
+                return text
+    return None
+
+
+def _store(image_hash, text):
+    with _cache.connect() as conn:
+        conn.execute("INSERT OR REPLACE INTO ocr (hash, text, created_at) VALUES (?, ?, ?)",
+                     (_to_signed(image_hash), text, time.time()))
+
+
+def _recognize(image_bytes, lang, timeout):
+    # OCR 프로세스에서 실행, (텍스트, OCR 시간) 반환 (시간 초과시 tesseract 프로세스 종료)
+    start = time.perf_counter()
+    Image.MAX_IMAGE_PIXELS = OCR_MAX_PIXELS
+    image = Image.open(io.BytesIO(image_bytes))
+    text = pytesseract.image_to_string(image, lang=lang, timeout=timeout).strip()
+    return text, time.perf_counter() - start
+
+
+def _download(url):
+    # 크기 제한을 넘으면 중단
+    response = Transport.Get(url, stream=True)
+    try:
+        if response.status_code != 200:
+            return None
+        if int(response.headers.get("Content-Length") or 0) > OCR_MAX_BYTES:
+            return None
+
+        data = bytearray()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            data += chunk
+            if len(data) > OCR_MAX_BYTES:
+                return None
+        return bytes(data)
+    finally:
+        response.close()
+
+
+def _open(image_bytes):
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+    except Exception:
+        return None
+    # 픽셀 수 제한 (압축 폭탄 방지, 헤더만 읽은 상태에서 확인)
+    if image.width * image.height > OCR_MAX_PIXELS:
+        return None
+    return image
+
+
+def RecognizeImages(image_urls):
+    """Return the OCR text of the given images, joined by blank lines.
+
+    Images are identified by their perceptual hash, so the same poster
+    uploaded to several boards (or re-encoded) is recognized only once.
+    """
+    if not (OCR_EN and OCR_AVAILABLE):
+        return ""
+
+    # 1. 다운로드, 해시 계산, 캐시 확인
+    texts = {}
+    jobs = {}
+    for i, url in enumerate(list(dict.fromkeys(image_urls))[:OCR_MAX_IMAGES]):
+        _count("images")
+        try:
+            image_bytes = _download(url)
+        except RequestException:
+            image_bytes = None
+        image = _open(image_bytes) if image_bytes else None
+        if image is None:
+            _count("skipped")
+            continue
+
+        image_hash = DHash(image)
+        text = _lookup(image_hash)
+        if text is not None:
+            _count("cache_hits")
+            texts[i] = text
+            continue
+
+        # 같은 공지 안의 같은 이미지는 한번만
+        if any(image_hash == job_hash for job_hash, _ in jobs.values()):
+            continue
+        # tesseract 시간 제한에 프로세스 시작 시간 여유를 더함 (대기 시간은 제외)
+        jobs[i] = (image_hash, _runner.submit(_recognize, image_bytes, OCR_LANG, OCR_TIMEOUT,
+                                              timeout=OCR_TIMEOUT + 5))
+
+    # 2. OCR 결과 수집
+    for i, (image_hash, future) in jobs.items():
+        try:
+            text, elapsed = future.result()
+        except Exception as e:
+            print(f"[OCR] {type(e).__name__}: {e}")
+            _count("failed")
+            continue
+
+        _count("seconds", elapsed)
+        _count("recognized")
+        _store(image_hash, text)
+        texts[i] = text
+
+    return "\n\n".join(texts[i] for i in sorted(texts) if texts[i])
+
+
+def NeedsOcr(text):
+    """True when the body text is short enough that the notice is likely an image."""
+    return OCR_EN and OCR_AVAILABLE and len((text or "").strip()) < OCR_MIN_TEXT_CHARS
+
+
+def Shutdown():
+    _runner.shutdown()
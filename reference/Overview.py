@@ -7,12 +7,20 @@
 *******************************************************************'''
 # -*- coding: utf-8 -*-
 
+import queue
+import threading
 import unicodedata
-from autoscraper import AutoScraper
-import Update
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import ModelRegistry
+import CompiledScraper
+import DataSource
+import SeenStore
+import ListCache
+import Parser
 import Content
-import ClovaSummary
-from Errors import FetchError, SummaryError
+import Summarizer
+from Errors import FetchError
 
 UPDATE_LIMIT = 5
 
@@ -22,9 +30,20 @@ try:
 except:
     SUMMARY_EN = True
 
-#모델, 버퍼파일 이름 재설정
+try:
+    import Hyperparms
+    MAX_PAGES = getattr(Hyperparms, "MAX_PAGES", 3)
+except:
+    MAX_PAGES = 3  # 신규 공지가 계속 이어질 때 확인할 최대 페이지 수
+
+try:
+    import Hyperparms
+    FETCH_WORKERS = getattr(Hyperparms, "FETCH_WORKERS", 4)
+except:
+    FETCH_WORKERS = 4  # 학과 하나에서 동시에 가져올 공지 본문 수
 
-scraper = AutoScraper()
+_page_lock = threading.Lock()
+_page_stats = {"depts": 0, "pages": 0}
 
 class NoticeData:
     def __init__(self,dept,title,url,summary =""):
@@ -35,69 +54,201 @@ class NoticeData:
 
 
 
+def ScrapePage(dept, model_id, page=1):
+    """Scrape one list page, skipping parsing when the page did not change.
+
+    Depts with a data_source read the list from JSON over plain HTTP and
+    only render the page in the browser when that fails.
+    """
+    url = dept.url.replace("{{page}}", str(page))
+
+    if dept.etc.get("data_source"):
+        with Parser.Timer("data_source"):
+            result = DataSource.Fetch(dept, page)
+        if result is not None:
+            return result
+
+    # 브라우저가 필요한 학과는 렌더링 시간 별도 집계
+    with Parser.Timer("render" if dept.css_sel else "source"):
+        source_args = dept.build_source(page)
+
+    # 모델은 한번만 로드하여 공유 (모델이 바뀌면 model_key도 바뀌어 목록 캐시가 무효화됨)
+    scraper, model_key = ModelRegistry.Get(model_id)
+
+    def scrape(url, html):
+        # 파싱은 Parser에서 한번만 수행하고 트리를 공유
+        soup = Parser.Parse(html, "list", for_scraper=True)
+
+        # 컴파일된 선택자 우선 사용, 결과가 없으면 autoscraper로 대체
+        with Parser.Timer("scrape_compiled"):
+            result = CompiledScraper.Extract(model_id, soup, url)
+        if result is not None:
+            return result
+
+        with Parser.Timer("scrape"):
+            result = scraper.get_result_similar(url=url, soup=soup, group_by_alias=True)
+
+        # autoscraper는 찾았는데 컴파일된 선택자만 실패한 경우에만 stale 표시
+        # (빈 페이지/오류 페이지로 다시 컴파일하지 않도록)
+        if result.get("title") and result.get("url"):
+            CompiledScraper.MarkStale(model_id)
+        return result
+
+    return ListCache.Scrape(url, model_key, scrape, html=source_args.get("html"))
+
+
+def PageStats():
+    """Return how many list pages were fetched so far."""
+    with _page_lock:
+        stats = dict(_page_stats)
+    stats["pages_per_dept"] = stats["pages"] / stats["depts"] if stats["depts"] else 0.0
+    return stats
+
+
+def SummaryText(content, truncated, summary=None):
+    if (not SUMMARY_EN):
+        return "요약기능이 비활성화되었습니다."
+    if (not content):
+        return "요약할 내용이 없습니다."
+    if summary is None:
+        return "요약을 실패하였습니다."
+    if truncated:
+        return summary + "\n(본문이 길어 앞부분만 요약되었습니다.)"
+    return summary
+
+
 def UpdateNotice(dept):
+    """Return the NoticeData list of new notices (None if nothing is new)."""
+    return list(IterNotice(dept)) or None
+
+
+def IterNotice(dept, ordered=True, on_failed=None):
+    """Yield the NoticeData of each new notice as soon as it is summarized.
+
+    With ordered=True the notices come in board order (a notice only waits
+    for the ones above it), otherwise in completion order. A notice whose
+    fetch or summary fails is skipped and reported to on_failed(url, e);
+    without on_failed the first such error is raised after the other
+    notices are yielded.
+    """
     dept_id = dept.dept_id
 
-    # 그룹된 결과 가져오기
-    model_id = dept_id.split('_')[0]
-    scraper.load(f"models/model_{model_id}.json")
+    # 학과에 해당하는 모델 (disu, disu_polaris는 같은 모델 공유)
+    model_id = ModelRegistry.ModelId(dept_id)
+
+    url_prefix = dept.etc.get("url_prefix","")
 
     # 페이지 1에 대한 소스 가져오기
-    source_args = dept.build_source(1)
-    scraped_dict = scraper.get_result_similar(**source_args, group_by_alias=True)
+    scraped_dict = ScrapePage(dept, model_id, 1)
     titles = scraped_dict["title"]
     urls = scraped_dict["url"]
-
-    # 페이지 2에 대한 소스 가져오기
-    if "{{page}}" in dept.url:
-        source_args_p2 = dept.build_source(2)
-        scraped_dict_p2 = scraper.get_result_similar(**source_args_p2, group_by_alias=True)
-        urls_p2 = scraped_dict_p2["url"]
-    else:
-        urls_p2 = []
+    pages = 1
 
     # 크롤링한 데이터가 없는경우
     if not titles or not urls:
         raise FetchError("Fetch Failed, There's nothing to fetch")
 
+    # 다음 페이지는 현재 페이지에 처음 보는 공지가 있을 때만 가져오기
+    # (1페이지가 그대로면 2페이지 생략, 3페이지 이후는 신규 공지가 계속 이어질 때만)
+    urls_p2 = []
+    page_urls = urls
+    if "{{page}}" in dept.url:
+        while pages < MAX_PAGES and SeenStore.Unseen(dept_id, [url_prefix + url for url in page_urls]):
+            pages += 1
+            page_urls = ScrapePage(dept, model_id, pages)["url"]
+            urls_p2 += page_urls
+
+    with _page_lock:
+        _page_stats["depts"] += 1
+        _page_stats["pages"] += pages
+
     # 신규 항목 인덱스 구하기 (차집합)
-    new_indices = Update.UpdateState(dept_id, urls, urls_p2)
+    new_indices = SeenStore.UpdateState(dept_id,
+                                        [url_prefix + url for url in urls],
+                                        [url_prefix + url for url in urls_p2],
+                                        titles)
     updated_count = len(new_indices)
 
-    # 신규 항목이 너무 많은 경우
+    # 신규 항목이 너무 많은 경우 (다음 주기에 다시 시도하지 않도록 기존 공지로 기록)
     if updated_count > UPDATE_LIMIT:
+        SeenStore.MarkSeen(dept_id, [url_prefix + urls[i] for i in new_indices])
         raise IndexError(f"Too many updated anouncement. Omitted {updated_count} new announcements.")
 
     # 새로운 항목이 없는경우
     if not new_indices:
-        return None
-    
-    notice_list = []
-    
-    # 신규 항목들에 대해서 component 생성
-    for new_idx in new_indices:
+        return
 
+    def fetch(new_idx):
         title = unicodedata.normalize('NFC', titles[new_idx])
-        url = dept.etc.get("url_prefix","") + urls[new_idx]
+        url = url_prefix + urls[new_idx]
+
+        #공지 내용 가져오기 (요약 입력 제한을 넘으면 잘림)
+        content_data = Content.ExtractContent(dept.div_args,url)
+        content = content_data.text if content_data else None
+        truncated = content_data.truncated if content_data else False
+        return title, url, content, truncated
+
+    def summarize(title, content):
+        return Summarizer.SummarizeMany([f"제목:{title}\n내용:\n{content}"])[0]
+
+    # 완료된 공지 (순번, NoticeData 또는 예외)
+    done = queue.Queue()
 
-        #공지 내용 가져오기
-        content = Content.FetchContent(dept.div_args,url)
+    # 본문은 동시에 가져오고, 본문이 도착하는 대로 바로 요약 시작
+    # (fetcher가 먼저 종료되도록 summarizer를 바깥에 둠)
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix=f"summary-{dept_id}") as summarizer, \
+         ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix=f"fetch-{dept_id}") as fetcher:
 
-        #클로바 요약
-        if (not SUMMARY_EN):
-            summary = "요약기능이 비활성화되었습니다."
-        elif (content):
+        def on_summarized(order, title, url, truncated, future):
             try:
-                summary = ClovaSummary.Summarize(f"제목:{title}\n내용:\n{content}")
-            except SummaryError as e:
-                summary = "요약을 실패하였습니다."
-        else:
-            summary = "요약할 내용이 없습니다."
+                done.put((order, NoticeData(dept, title, url, SummaryText(True, truncated, future.result()))))
+            except Exception as e:
+                done.put((order, e))
+
+        def on_fetched(order, future):
+            if future.cancelled():
+                return
+            try:
+                title, url, content, truncated = future.result()
+                if SUMMARY_EN and content:
+                    summary_future = summarizer.submit(summarize, title, content)
+                    summary_future.add_done_callback(partial(on_summarized, order, title, url, truncated))
+                else:
+                    done.put((order, NoticeData(dept, title, url, SummaryText(content, truncated))))
+            except Exception as e:
+                done.put((order, e))
+
+        for order, new_idx in enumerate(new_indices):
+            fetcher.submit(fetch, new_idx).add_done_callback(partial(on_fetched, order))
+
+        ready = {}
+        next_order = 0
+        errors = []
+        for _ in new_indices:
+            order, result = done.get()
+            if isinstance(result, Exception):
+                # 실패한 공지만 건너뛰고 나머지 공지는 계속 진행
+                if on_failed is not None:
+                    on_failed(url_prefix + urls[new_indices[order]], result)
+                else:
+                    errors.append(result)
+                result = None
 
-        notice_list.append(NoticeData(dept, title, url, summary))
+            if not ordered:
+                if result is not None:
+                    yield result
+                continue
 
-    return notice_list
+            # 앞 순번이 모두 끝난 공지부터 내보냄
+            ready[order] = result
+            while next_order in ready:
+                result = ready.pop(next_order)
+                next_order += 1
+                if result is not None:
+                    yield result
 
+    if errors:
+        raise errors[0]
 
 if __name__ == '__main__':
     import DeptInfo
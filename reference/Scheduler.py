@@ -0,0 +1,183 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : Scheduler.py
+  - Description      : Poll each dept at an adaptive interval (daemon)
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+
+import main
+import Errors
+import DiscordMsg
+import SeenStore
+from DeptInfo import DEPTS
+
+try:
+    import Hyperparms
+    MIN_INTERVAL = getattr(Hyperparms, "MIN_INTERVAL", 10 * 60)
+    MAX_INTERVAL = getattr(Hyperparms, "MAX_INTERVAL", 6 * 3600)
+    RATE_WINDOW_DAYS = getattr(Hyperparms, "RATE_WINDOW_DAYS", 14)
+    POSTS_PER_POLL = getattr(Hyperparms, "POSTS_PER_POLL", 0.25)
+    BUSY_WINDOWS = getattr(Hyperparms, "BUSY_WINDOWS", None)
+except:
+    MIN_INTERVAL = 10 * 60          # 최소 확인 간격 (초)
+    MAX_INTERVAL = 6 * 3600         # 최대 확인 간격 (초)
+    RATE_WINDOW_DAYS = 14           # 게시 빈도 계산 기간 (일)
+    POSTS_PER_POLL = 0.25           # 확인 한번당 기대 신규 공지 수 (작을수록 자주 확인)
+    BUSY_WINDOWS = None
+
+# 바쁜 시기 : 조건(월, 일, 요일, 시간)이 모두 맞으면 간격에 factor를 곱함 (생략한 조건은 항상 참)
+if BUSY_WINDOWS is None:
+    BUSY_WINDOWS = [
+        # 개강, 수강신청 시기 평일 업무시간
+        {"months": [2, 3, 8, 9], "weekdays": [0, 1, 2, 3, 4], "hours": (9, 18), "factor": 0.5},
+    ]
+
+SCHEDULE_FILE = "buffers/schedule.json"
+
+
+def PostingRate(dept_id, now=None):
+    """Posts per hour of dept_id over the last RATE_WINDOW_DAYS days."""
+    now = now or time.time()
+    window = RATE_WINDOW_DAYS * 86400
+    post_times = SeenStore.PostTimes(dept_id, now - window)
+    return len(post_times) / (window / 3600)
+
+
+def BusyFactor(moment):
+    factor = 1.0
+    for busy in BUSY_WINDOWS:
+        if "months" in busy and moment.month not in busy["months"]:
+            continue
+        if "days" in busy and not busy["days"][0] <= moment.day <= busy["days"][1]:
+            continue
+        if "weekdays" in busy and moment.weekday() not in busy["weekdays"]:
+            continue
+        if "hours" in busy and not busy["hours"][0] <= moment.hour < busy["hours"][1]:
+            continue
+        factor = min(factor, busy["factor"])
+    return factor
+
+
+def PollInterval(dept_id, now=None):
+    """Seconds until the next poll of dept_id, within [MIN_INTERVAL, MAX_INTERVAL]."""
+    now = now or time.time()
+    rate = PostingRate(dept_id, now)
+
+    # 확인 한번에 평균 POSTS_PER_POLL개의 신규 공지가 생기도록 간격 설정
+    interval = POSTS_PER_POLL / rate * 3600 if rate > 0 else MAX_INTERVAL
+    interval *= BusyFactor(datetime.fromtimestamp(now))
+    return max(MIN_INTERVAL, min(MAX_INTERVAL, interval))
+
+
+class Scheduler:
+    def __init__(self, depts=DEPTS):
+        self.depts = depts
+        self.next_due = self._load()
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+        self.run_all = False
+        self.last_cycle = None
+
+    def _load(self):
+        try:
+            with open(SCHEDULE_FILE, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        #부모 디렉터리 없으면 생성
+        os.makedirs(os.path.dirname(SCHEDULE_FILE), exist_ok=True)
+
+        tmp_path = SCHEDULE_FILE + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.next_due, file)
+        os.replace(tmp_path, SCHEDULE_FILE)
+
+    def due_depts(self, now):
+        return [dept for dept in self.depts if self.next_due.get(dept.dept_id, 0) <= now]
+
+    def run_due(self, now=None):
+        """Run one cycle over the depts that are due; returns the failures."""
+        now = now or time.time()
+        due = self.due_depts(now)
+
+        # 즉시 실행 요청시 전체 학과 실행
+        if self.run_all:
+            self.run_all = False
+            due = list(self.depts)
+
+        if not due:
+            return []
+
+        failures = main.RunDepts(due)
+
+        # 연결 오류는 다음 주기에 이어서 처리 (체크포인트로 재개), 그 외 오류는 알림
+        main.ReportFailures([(dept, e) for dept, e in failures if not main.IsConnectionError(e)])
+        main.FinishCycle()
+
+        failed_ids = {dept.dept_id for dept, e in failures}
+        finished = time.time()
+        for dept in due:
+            if dept.dept_id in failed_ids:
+                self.next_due[dept.dept_id] = finished + MIN_INTERVAL
+            else:
+                self.next_due[dept.dept_id] = finished + PollInterval(dept.dept_id, finished)
+        self._save()
+
+        self.last_cycle = {"time": finished, "depts": [dept.dept_id for dept in due],
+                           "failed": sorted(failed_ids)}
+        return failures
+
+    def seconds_until_next(self, now=None):
+        now = now or time.time()
+        upcoming = [self.next_due.get(dept.dept_id, 0) for dept in self.depts]
+        return max(0.0, min(upcoming) - now) if upcoming else MAX_INTERVAL
+
+    def serve(self):
+        """Poll until stop() is called."""
+        while not self.stop_event.is_set():
+            try:
+                self.run_due()
+                delay = self.seconds_until_next()
+            except Exception as e:
+                # 주기 전체가 실패해도 알림 후 스케줄러는 계속 동작
+                debug_message = Errors.InfoCollect(e,None)
+                print(debug_message)
+                try:
+                    DiscordMsg.SendDebugMessage(debug_message)
+                except Exception:
+                    pass
+                delay = MIN_INTERVAL
+            self.wake_event.wait(delay)
+            self.wake_event.clear()
+
+    def trigger(self):
+        """Run every dept on the next wake-up, right now."""
+        self.run_all = True
+        self.wake_event.set()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+
+
+if __name__ == '__main__':
+    scheduler = Scheduler()
+
+    # 종료 신호를 받으면 현재 주기를 마치고 종료
+    signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: scheduler.stop())
+
+    for dept in DEPTS:
+        print(f"{dept.dept_id} : every {PollInterval(dept.dept_id) / 60:.0f} min")
+    scheduler.serve()
@@ -0,0 +1,75 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : Secrets.py
+  - Description      : Process-wide cache of secrets files and derived clients
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import threading
+
+_lock = threading.Lock()
+_files = {}     # file_path -> (mtime, api_info)
+_derived = {}   # (file_path, name) -> (mtime, object)
+
+
+def _mtime(file_path):
+    try:
+        return os.stat(file_path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {file_path}")
+
+
+def _read(file_path, required_keys):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        try:
+            api_info = json.load(file)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON format in {file_path}: {e}")
+
+    required_keys = set(required_keys)
+    if not required_keys.issubset(api_info.keys()):
+        raise ValueError(f"Missing required keys in JSON file: {required_keys - api_info.keys()}")
+
+    return api_info
+
+
+def _load(file_path, required_keys):
+    mtime = _mtime(file_path)
+
+    with _lock:
+        cached = _files.get(file_path)
+        if cached is not None and cached[0] == mtime:
+            return cached
+
+    cached = (mtime, _read(file_path, required_keys))
+    with _lock:
+        _files[file_path] = cached
+    return cached
+
+
+def Load(file_path, required_keys=()):
+    """Return the parsed secrets file, re-reading it only when its mtime changes."""
+    return _load(file_path, required_keys)[1]
+
+
+def Derived(file_path, name, build, required_keys=()):
+    """Return build(api_info) for the secrets file, rebuilt only when the file changes.
+
+    Used for long-lived objects such as prebuilt header dicts or API clients.
+    """
+    mtime, api_info = _load(file_path, required_keys)
+    key = (file_path, name)
+
+    with _lock:
+        cached = _derived.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    obj = build(api_info)
+    with _lock:
+        _derived[key] = (mtime, obj)
+    return obj
@@ -0,0 +1,208 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : SeenStore.py
+  - Description      : Indexed store of notices already seen per dept
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+STORE_FILE = "buffers/seen.db"
+
+# 공지 식별에 영향을 주지 않는 쿼리 파라미터 (세션 토큰, 목록 페이지 번호, 유입 추적)
+IGNORED_PARAMS = {"phpsessid", "jsessionid", "sid", "sessionid", "session_id",
+                  "page", "pagenum", "pno", "cpage",
+                  "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content"}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+STATUS_SEEN = "seen"            # 기존 공지 (전달 대상 아님)
+STATUS_NEW = "new"              # 신규 공지로 판정됨
+STATUS_DELIVERED = "delivered"  # 전달 완료
+STATUS_FAILED = "failed"        # 여러 번 시도했지만 전달하지 못함
+
+MAX_ATTEMPTS = 3  # 가져오기/전달에 실패한 신규 공지를 다시 시도할 최대 횟수 (실행마다 한번, 처음 포함)
+
+_lock = threading.Lock()
+_conn = None
+
+
+def _connect():
+    global _conn
+    if _conn is None:
+        #부모 디렉터리 없으면 생성
+        os.makedirs(os.path.dirname(STORE_FILE), exist_ok=True)
+
+        _conn = sqlite3.connect(STORE_FILE, check_same_thread=False)
+        _conn.execute("""CREATE TABLE IF NOT EXISTS notices (
+                            dept_id TEXT NOT NULL,
+                            url_key TEXT NOT NULL,
+                            url TEXT NOT NULL,
+                            title TEXT,
+                            first_seen REAL NOT NULL,
+                            status TEXT NOT NULL,
+                            delivered_at REAL,
+                            attempts INTEGER NOT NULL DEFAULT 0)""")
+        # 이전 버전 저장소에는 attempts 열이 없음
+        columns = [row[1] for row in _conn.execute("PRAGMA table_info(notices)")]
+        if "attempts" not in columns:
+            _conn.execute("ALTER TABLE notices ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        _conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_notices_key ON notices(dept_id, url_key)")
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_notices_first_seen ON notices(dept_id, first_seen)")
+        _conn.commit()
+    return _conn
+
+
+def CanonicalUrl(url):
+    """Normalize url so that param order or session tokens do not make a notice look new."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    # 기본 포트 제거
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+
+    # ;jsessionid=... 형태의 경로 파라미터 제거
+    path = parts.path.split(";")[0] or "/"
+
+    # 무시할 파라미터 제거 후 정렬
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k.lower() not in IGNORED_PARAMS]
+    query.sort()
+
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def _known_keys(conn, dept_id, keys):
+    return set(_key_status(conn, dept_id, keys))
+
+
+def _key_status(conn, dept_id, keys):
+    status = {}
+    keys = list(keys)
+    # sqlite 변수 개수 제한을 넘지 않도록 나눠서 조회
+    for i in range(0, len(keys), 500):
+        chunk = keys[i:i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(f"SELECT url_key, status FROM notices WHERE dept_id = ? AND url_key IN ({placeholders})",
+                            [dept_id, *chunk])
+        status.update(rows)
+    return status
+
+
+def Unseen(dept_id, urls):
+    """Return indices of urls never seen for dept_id (read only)."""
+    keys = [CanonicalUrl(url) for url in urls]
+    with _lock:
+        known = _known_keys(_connect(), dept_id, keys)
+    return [i for i, key in enumerate(keys) if key not in known]
+
+
+def UpdateState(dept_id, urls, urls_p2=[], titles=None):
+    """Record the urls of the current list pages and return the indices of
+    urls (page 1) that were never seen before.
+
+    Only the new urls are inserted. The first run of a dept only records
+    the current notices as seen and returns nothing. Notices found new by
+    an earlier run but never delivered (e.g. the run stopped mid-stream)
+    are returned again until they are delivered or marked failed
+    (RecordFailure / MarkFailed).
+    """
+    keys = [CanonicalUrl(url) for url in urls]
+    keys_p2 = [CanonicalUrl(url) for url in urls_p2]
+    now = time.time()
+
+    with _lock:
+        conn = _connect()
+
+        first_run = conn.execute("SELECT 1 FROM notices WHERE dept_id = ? LIMIT 1", (dept_id,)).fetchone() is None
+        status = _key_status(conn, dept_id, keys + keys_p2)
+        known = set(status)
+
+        new_indices = []
+        rows = []
+        for i, key in enumerate(keys):
+            if key in known:
+                # 신규로 판정됐지만 전달되지 않은 공지는 다시 신규로
+                if status.pop(key, None) == STATUS_NEW:
+                    new_indices.append(i)
+                continue
+            known.add(key)  # 같은 페이지 내 중복 방지
+            row_status = STATUS_SEEN if first_run else STATUS_NEW
+            if not first_run:
+                new_indices.append(i)
+            rows.append((dept_id, key, urls[i], titles[i] if titles else None, now, row_status))
+
+        # 2페이지에만 있는 항목은 신규로 보지 않고 기록만 함
+        for i, key in enumerate(keys_p2):
+            if key in known:
+                continue
+            known.add(key)
+            rows.append((dept_id, key, urls_p2[i], None, now, STATUS_SEEN))
+
+        conn.executemany("""INSERT OR IGNORE INTO notices (dept_id, url_key, url, title, first_seen, status)
+                            VALUES (?, ?, ?, ?, ?, ?)""", rows)
+        conn.commit()
+
+    return new_indices
+
+
+def RecordFailure(dept_id, url):
+    """Count a failed attempt of a new notice (call once per run); after
+    MAX_ATTEMPTS it is marked failed and no longer returned as new."""
+    with _lock:
+        conn = _connect()
+        key = CanonicalUrl(url)
+        conn.execute("UPDATE notices SET attempts = attempts + 1 WHERE dept_id = ? AND url_key = ? AND status = ?",
+                     (dept_id, key, STATUS_NEW))
+        conn.execute("UPDATE notices SET status = ? WHERE dept_id = ? AND url_key = ? AND status = ? AND attempts >= ?",
+                     (STATUS_FAILED, dept_id, key, STATUS_NEW, MAX_ATTEMPTS))
+        conn.commit()
+
+
+def MarkFailed(dept_id, url):
+    """Give up on a notice that could not be delivered (MarkDelivered still wins)."""
+    with _lock:
+        conn = _connect()
+        conn.execute("UPDATE notices SET status = ? WHERE dept_id = ? AND url_key = ? AND status != ?",
+                     (STATUS_FAILED, dept_id, CanonicalUrl(url), STATUS_DELIVERED))
+        conn.commit()
+
+
+def MarkSeen(dept_id, urls):
+    """Record urls as seen so they are no longer returned as new."""
+    with _lock:
+        conn = _connect()
+        conn.executemany("UPDATE notices SET status = ? WHERE dept_id = ? AND url_key = ? AND status = ?",
+                         [(STATUS_SEEN, dept_id, CanonicalUrl(url), STATUS_NEW) for url in urls])
+        conn.commit()
+
+
+def MarkDelivered(dept_id, url):
+    with _lock:
+        conn = _connect()
+        conn.execute("UPDATE notices SET status = ?, delivered_at = ? WHERE dept_id = ? AND url_key = ?",
+                     (STATUS_DELIVERED, time.time(), dept_id, CanonicalUrl(url)))
+        conn.commit()
+
+
+def PostTimes(dept_id, since):
+    """Return first-seen times (epoch) of notices posted since the given time.
+
+    Notices recorded only as seen (first run seeding, deeper pages) are not
+    counted as posts.
+    """
+    with _lock:
+        rows = _connect().execute("""SELECT first_seen FROM notices
+                                     WHERE dept_id = ? AND first_seen >= ? AND status != ?
+                                     ORDER BY first_seen""",
+                                  (dept_id, since, STATUS_SEEN)).fetchall()
+    return [row[0] for row in rows]
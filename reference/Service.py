@@ -0,0 +1,195 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : Service.py
+  - Description      : Resident service keeping models and pools warm
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import Scheduler
+import ModelRegistry
+import BrowserPool
+import DeliveryQueue
+import Transport
+import DiscordMsg
+import Summarizer
+import ListCache
+import SummaryCache
+import Parser
+import DataSource
+import OCR
+import Attachment
+
+try:
+    import Hyperparms
+    CONTROL_SOCKET = getattr(Hyperparms, "CONTROL_SOCKET", "buffers/sauron.sock")
+except:
+    CONTROL_SOCKET = "buffers/sauron.sock"  # 제어 소켓 경로 (run / health / stop)
+
+CONTROL_TIMEOUT = 10  # 제어 명령 응답 대기 시간 (초)
+
+
+def Warmup():
+    """Load what every cycle needs once: models, secrets and selenium."""
+    # 모델 미리 로드
+    models = ModelRegistry.Preload()
+
+    # 비밀 정보 미리 로드 (실패해도 첫 주기에서 다시 시도)
+    backend = Summarizer.GetBackend()
+    loaders = [DiscordMsg.GetHeaders]
+    if hasattr(backend, "GetExecutor"):
+        loaders.append(backend.GetExecutor)
+    for load in loaders:
+        try:
+            load()
+        except Exception as e:
+            print(f"[Service] warmup skipped {load.__module__} : {e}")
+
+    # selenium은 브라우저 학과 처리 전에 미리 import (BrowserPool은 처음 쓸 때 import)
+    try:
+        importlib.import_module("selenium.webdriver")
+    except ImportError:
+        pass
+
+    return models
+
+
+class ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        command = self.rfile.readline().decode('utf-8').strip()
+        try:
+            reply = self.server.service.command(command)
+        except Exception as e:
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write((json.dumps(reply, ensure_ascii=False) + "\n").encode('utf-8'))
+
+
+class ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class Service:
+    def __init__(self, socket_path=CONTROL_SOCKET):
+        self.socket_path = socket_path
+        self.scheduler = Scheduler.Scheduler()
+        self.started = time.time()
+        self.models = []
+        self.server = None
+
+    def command(self, command):
+        if command == "health":
+            return self.health()
+        if command == "run":
+            self.scheduler.trigger()
+            return {"ok": True}
+        if command == "stop":
+            self.scheduler.stop()
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown command '{command}'"}
+
+    def health(self):
+        """Liveness and the counters of the last cycle."""
+        now = time.time()
+        last_cycle = self.scheduler.last_cycle
+
+        # 마지막 주기가 최대 간격의 2배 이상 지났으면 정체로 판단
+        stalled = now - (last_cycle["time"] if last_cycle else self.started) > 2 * Scheduler.MAX_INTERVAL
+        failed = bool(last_cycle and last_cycle["failed"])
+
+        return {"ok": not stalled,
+                "status": "stalled" if stalled else "degraded" if failed else "healthy",
+                "pid": os.getpid(),
+                "uptime": round(now - self.started),
+                "models": self.models,
+                "last_cycle": last_cycle,
+                "next_poll_in": round(self.scheduler.seconds_until_next(now)),
+                "browser_pool": BrowserPool.Stats(),
+                "list_cache": ListCache.Stats(),
+                "summary_cache": SummaryCache.Stats(),
+                "data_source": DataSource.Stats(),
+                "ocr": OCR.Stats(),
+                "attachment": Attachment.Stats(),
+                "parser": Parser.Stats()}
+
+    def _start_control(self):
+        #부모 디렉터리 없으면 생성
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+
+        # 이전 실행에서 남은 소켓 파일 제거
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        self.server = ControlServer(self.socket_path, ControlHandler)
+        self.server.service = self
+        thread = threading.Thread(target=self.server.serve_forever, name="control", daemon=True)
+        thread.start()
+
+    def _stop_control(self):
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        try:
+            os.remove(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def serve(self):
+        """Warm up, serve until stopped, then release every pool."""
+        self.models = Warmup()
+        self._start_control()
+        print(f"[Service] ready (models : {', '.join(self.models)}, control : {self.socket_path})")
+
+        try:
+            self.scheduler.serve()
+        finally:
+            # 1. 제어 소켓 종료
+            self._stop_control()
+            # 2. 남은 전달 마무리
+            DeliveryQueue.Join()
+            # 3. 브라우저, OCR/첨부파일 프로세스, HTTP 연결 정리
+            BrowserPool.Shutdown()
+            OCR.Shutdown()
+            Attachment.Shutdown()
+            Transport.Close()
+            print("[Service] stopped")
+
+    def stop(self):
+        self.scheduler.stop()
+
+
+def SendCommand(command, socket_path=CONTROL_SOCKET):
+    """Send a control command to a running service and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(CONTROL_TIMEOUT)
+        client.connect(socket_path)
+        client.sendall((command + "\n").encode('utf-8'))
+        with client.makefile('r', encoding='utf-8') as reader:
+            return json.loads(reader.readline())
+
+
+if __name__ == '__main__':
+    # 인자가 있으면 실행중인 서비스에 명령 전달 (run / health / stop)
+    if len(sys.argv) > 1:
+        reply = SendCommand(sys.argv[1])
+        print(json.dumps(reply, ensure_ascii=False, indent=2))
+        sys.exit(0 if reply.get("ok") else 1)
+
+    service = Service()
+
+    # 종료 신호를 받으면 현재 주기를 마치고 종료
+    signal.signal(signal.SIGTERM, lambda signum, frame: service.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: service.stop())
+
+    service.serve()
@@ -0,0 +1,136 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : Summarizer.py
+  - Description      : Pick the summary backend (Clova or local LLM)
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import importlib
+
+from Errors import SummaryError
+import Chunker
+
+try:
+    import Hyperparms
+    SUMMARY_BACKEND = getattr(Hyperparms, "SUMMARY_BACKEND", "clova")
+    CHUNK_EN = getattr(Hyperparms, "CHUNK_EN", True)
+    CHUNK_TOKENS = getattr(Hyperparms, "CHUNK_TOKENS", 4000)
+    MAX_CHUNKS = getattr(Hyperparms, "MAX_CHUNKS", 16)
+except:
+    SUMMARY_BACKEND = "clova"  # 요약 방식 (clova : Clova Studio, local : Ollama 호환 서버)
+    CHUNK_EN = True            # 긴 공지를 나눠서 요약 후 합칠지 여부
+    CHUNK_TOKENS = 4000        # 요청 하나에 보낼 최대 토큰 수 (추정치)
+    MAX_CHUNKS = 16            # 공지 하나당 최대 조각 수 (본문 최대 길이 결정)
+
+REDUCE_DEPTH = 2  # 부분 요약을 다시 합치는 최대 단계
+
+# 백엔드 모듈은 모두 아래를 제공
+#   MAX_INPUT_CHARS : 한번에 요약할 수 있는 최대 글자 수
+#   Summarize(content) -> str
+#   SummarizeMany(contents) -> [str or None] (실패한 항목은 None)
+BACKENDS = {
+    "clova": "ClovaSummary",
+    "local": "LocalSummary",
+}
+
+
+def GetBackend(name=None):
+    """Return the backend module selected by SUMMARY_BACKEND (or name)."""
+    name = name or SUMMARY_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown summary backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return importlib.import_module(BACKENDS[name])
+
+
+MAX_INPUT_CHARS = GetBackend().MAX_INPUT_CHARS
+
+# 조각은 백엔드 입력 제한도 넘지 않아야 함 (제목 등 여유분 제외)
+CHUNK_TOKENS = min(CHUNK_TOKENS, int((MAX_INPUT_CHARS - 1000) / Chunker.CHARS_PER_TOKEN))
+
+# 본문 최대 길이 (넘는 부분은 Content에서 잘림)
+if CHUNK_EN:
+    MAX_CONTENT_CHARS = int(CHUNK_TOKENS * Chunker.CHARS_PER_TOKEN * MAX_CHUNKS)
+else:
+    MAX_CONTENT_CHARS = MAX_INPUT_CHARS - 1000
+
+
+def NeedsChunking(content):
+    return CHUNK_EN and Chunker.EstimateTokens(content) > CHUNK_TOKENS
+
+
+def _MapInputs(content):
+    # 첫 줄(제목)은 모든 조각에 붙여 문맥 유지
+    # 조각 번호는 넣지 않음 (본문이 수정되어도 바뀌지 않은 조각은 캐시된 요약 재사용)
+    head, _, body = content.partition("\n")
+    budget = CHUNK_TOKENS - Chunker.EstimateTokens(head) - 10
+    return [f"{head}\n내용(일부):\n{chunk}" for chunk in Chunker.Split(body, budget)]
+
+
+def _ReduceInput(content, partials):
+    head = content.partition("\n")[0]
+    return f"{head}\n내용(부분 요약):\n" + "\n".join(f"- {partial}" for partial in partials)
+
+
+def _SummarizeAll(backend, contents, depth):
+    # 1. 짧은 내용은 그대로, 긴 내용은 조각으로 나눠 한번에 요청 (백엔드가 동시 처리 및 캐시)
+    requests = []
+    plans = []
+    for content in contents:
+        if NeedsChunking(content) and depth < REDUCE_DEPTH:
+            chunks = _MapInputs(content)
+        else:
+            chunks = None
+            content = content[:MAX_INPUT_CHARS]
+        start = len(requests)
+        requests.extend(chunks or [content])
+        plans.append((start, len(requests), chunks is not None))
+
+    summaries = backend.SummarizeMany(requests)
+
+    # 2. 조각 요약을 다시 요약 (합친 내용이 길면 한 단계 더 나눔)
+    results = []
+    reduce_indices = []
+    reduce_inputs = []
+    for i, (start, end, chunked) in enumerate(plans):
+        if not chunked:
+            results.append(summaries[start])
+            continue
+
+        # 실패한 조각은 제외하고 합침
+        partials = [summary for summary in summaries[start:end] if summary]
+        results.append(None)
+        if not partials:
+            continue
+        if len(partials) == 1:
+            results[i] = partials[0]
+            continue
+        reduce_indices.append(i)
+        reduce_inputs.append(_ReduceInput(contents[i], partials))
+
+    if reduce_inputs:
+        for i, summary in zip(reduce_indices, _SummarizeAll(backend, reduce_inputs, depth + 1)):
+            results[i] = summary
+
+    return results
+
+
+def Summarize(content):
+    if not NeedsChunking(content):
+        return GetBackend().Summarize(content)
+
+    summary = SummarizeMany([content])[0]
+    if summary is None:
+        raise SummaryError("Every chunk of the content failed to summarize")
+    return summary
+
+
+def SummarizeMany(contents):
+    """Summarize several contents; failed items are None.
+
+    Contents over CHUNK_TOKENS are split by Chunker, the chunks of every
+    content are summarized in parallel (map) and the partial summaries are
+    summarized again into one (reduce).
+    """
+    return _SummarizeAll(GetBackend(), list(contents), 0)
@@ -0,0 +1,112 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : SummaryCache.py
+  - Description      : Persistent summary cache keyed by content hash
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+try:
+    import Hyperparms
+    SUMMARY_CACHE_MAX_ENTRIES = getattr(Hyperparms, "SUMMARY_CACHE_MAX_ENTRIES", 5000)
+    SUMMARY_CACHE_MAX_AGE_DAYS = getattr(Hyperparms, "SUMMARY_CACHE_MAX_AGE_DAYS", 90)
+except:
+    SUMMARY_CACHE_MAX_ENTRIES = 5000    # 최대 저장 항목 수 (오래 사용하지 않은 항목부터 삭제)
+    SUMMARY_CACHE_MAX_AGE_DAYS = 90     # 최대 보관 기간 (일)
+
+CACHE_FILE = "buffers/summary_cache.db"
+
+_lock = threading.Lock()
+_conn = None
+_stats = {"hits": 0, "misses": 0, "saved_chars": 0}
+
+
+def _connect():
+    global _conn
+    if _conn is None:
+        #부모 디렉터리 없으면 생성
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+
+        _conn = sqlite3.connect(CACHE_FILE, check_same_thread=False)
+        _conn.execute("""CREATE TABLE IF NOT EXISTS summaries (
+                            key TEXT PRIMARY KEY,
+                            summary TEXT NOT NULL,
+                            created_at REAL NOT NULL,
+                            last_used REAL NOT NULL)""")
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_last_used ON summaries(last_used)")
+        _conn.commit()
+    return _conn
+
+
+def MakeKey(content, namespace=""):
+    """Hash of the normalized content (NFC, collapsed whitespace).
+
+    namespace separates summaries of different backends/models ("" is Clova).
+    """
+    text = unicodedata.normalize('NFC', content)
+    text = re.sub(r'\s+', ' ', text).strip()
+    if namespace:
+        text = f"{namespace}\n{text}"
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def Get(content, namespace=""):
+    """Return the cached summary of content, or None."""
+    key = MakeKey(content, namespace)
+    now = time.time()
+    min_created = now - SUMMARY_CACHE_MAX_AGE_DAYS * 86400
+
+    with _lock:
+        conn = _connect()
+        row = conn.execute("SELECT summary FROM summaries WHERE key = ? AND created_at >= ?",
+                           (key, min_created)).fetchone()
+        if row is None:
+            _stats["misses"] += 1
+            return None
+
+        conn.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (now, key))
+        conn.commit()
+        _stats["hits"] += 1
+        _stats["saved_chars"] += len(content)
+        return row[0]
+
+
+def Put(content, summary, namespace=""):
+    key = MakeKey(content, namespace)
+    now = time.time()
+
+    with _lock:
+        conn = _connect()
+        conn.execute("INSERT OR REPLACE INTO summaries (key, summary, created_at, last_used) VALUES (?, ?, ?, ?)",
+                     (key, summary, now, now))
+        _Evict(conn, now)
+        conn.commit()
+
+
+def _Evict(conn, now):
+    # 1. 보관 기간이 지난 항목 삭제
+    conn.execute("DELETE FROM summaries WHERE created_at < ?",
+                 (now - SUMMARY_CACHE_MAX_AGE_DAYS * 86400,))
+
+    # 2. 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    conn.execute("""DELETE FROM summaries WHERE key IN (
+                        SELECT key FROM summaries ORDER BY last_used DESC LIMIT -1 OFFSET ?)""",
+                 (SUMMARY_CACHE_MAX_ENTRIES,))
+
+
+def Stats():
+    """Return hit/miss counters of the current process."""
+    with _lock:
+        stats = dict(_stats)
+    total = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / total if total else 0.0
+    return stats
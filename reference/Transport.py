@@ -0,0 +1,96 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : Transport.py
+  - Description      : Shared HTTP sessions (keep-alive, timeout, retry)
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import Hyperparms
+    CONNECT_TIMEOUT = getattr(Hyperparms, "CONNECT_TIMEOUT", 5)
+    READ_TIMEOUT = getattr(Hyperparms, "READ_TIMEOUT", 30)
+    HTTP_RETRIES = getattr(Hyperparms, "HTTP_RETRIES", 3)
+    HTTP_BACKOFF = getattr(Hyperparms, "HTTP_BACKOFF", 0.5)
+    HTTP_POOL_SIZE = getattr(Hyperparms, "HTTP_POOL_SIZE", 8)
+except:
+    CONNECT_TIMEOUT = 5     # 연결 타임아웃 (초)
+    READ_TIMEOUT = 30       # 응답 타임아웃 (초)
+    HTTP_RETRIES = 3        # 일시적 오류 재시도 횟수
+    HTTP_BACKOFF = 0.5      # 재시도 간격 (0.5, 1, 2, ... 초)
+    HTTP_POOL_SIZE = 8      # 호스트별 유지할 연결 수
+
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# 일시적인 서버 오류로 간주할 상태 코드
+RETRY_STATUS = (500, 502, 503, 504)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _build_session():
+    # 연결 실패는 모든 메서드에서 재시도하지만,
+    # 응답 이후의 재시도(상태 코드, 읽기 오류)는 멱등 메서드(GET 등)만 허용
+    retry = Retry(
+        total=HTTP_RETRIES,
+        connect=HTTP_RETRIES,
+        read=HTTP_RETRIES,
+        status=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def GetSession(url):
+    """Return the pooled session for the host of url."""
+    parsed = urlparse(url)
+    key = (parsed.scheme, parsed.netloc)
+
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _build_session()
+            _sessions[key] = session
+        return session
+
+
+def Request(method, url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """requests.request through the pooled per-host session with a default timeout."""
+    return GetSession(url).request(method, url, timeout=timeout, **kwargs)
+
+
+def Get(url, **kwargs):
+    return Request("GET", url, **kwargs)
+
+
+def Post(url, **kwargs):
+    return Request("POST", url, **kwargs)
+
+
+def Close():
+    """Close every pooled session (connections are reopened on next use)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,143 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : Worker.py
+  - Description      : Shared scaffolding of the OCR / attachment workers
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+# 스레드가 많은 프로세스에서 fork하지 않도록 spawn 사용
+_context = multiprocessing.get_context("spawn")
+
+
+class WorkerError(Exception):
+    """A job process failed or exited without a result."""
+
+
+def _child(conn, fn, args):
+    # 작업 프로세스에서 실행, 결과 또는 예외를 전달
+    try:
+        result = ("ok", fn(*args))
+    except Exception as e:
+        result = ("error", f"{type(e).__name__}: {e}")
+    conn.send(result)
+    conn.close()
+
+
+class Runner:
+    """Run each job in its own process, at most `workers` at a time.
+
+    The time limit of a job starts when its process starts (not while it
+    waits for a free slot), and only that process is killed when the job
+    runs over it, so a slow file never affects the other jobs.
+    """
+
+    def __init__(self, workers):
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self._processes = set()
+
+    def submit(self, fn, *args, timeout):
+        """Start fn(*args) in the background; returns a Future of its result.
+
+        The Future raises TimeoutError when the job ran longer than timeout
+        seconds, or WorkerError when it failed.
+        """
+        future = Future()
+        thread = threading.Thread(target=self._run, args=(future, fn, args, timeout), daemon=True)
+        thread.start()
+        return future
+
+    def _run(self, future, fn, args, timeout):
+        with self._slots:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self._call(fn, args, timeout))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _call(self, fn, args, timeout):
+        receiver, sender = _context.Pipe(duplex=False)
+        process = _context.Process(target=_child, args=(sender, fn, args), daemon=True)
+        with self._lock:
+            self._processes.add(process)
+        try:
+            process.start()
+            sender.close()
+
+            # 대기 시간은 제외하고 프로세스 시작 시점부터 시간 제한
+            if not receiver.poll(timeout):
+                raise TimeoutError(f"timed out after {timeout}s")
+            try:
+                status, value = receiver.recv()
+            except EOFError:
+                process.join(5)
+                raise WorkerError(f"worker exited with code {process.exitcode}")
+            if status != "ok":
+                raise WorkerError(value)
+            return value
+        finally:
+            # 시간 초과시 해당 작업 프로세스만 종료
+            if process.is_alive():
+                process.terminate()
+            process.join(5)
+            receiver.close()
+            with self._lock:
+                self._processes.discard(process)
+
+    def shutdown(self):
+        """Kill the job processes still running."""
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+
+class Counters:
+    """Thread-safe counters returned by the Stats() of a module."""
+
+    def __init__(self, **initial):
+        self._lock = threading.Lock()
+        self._values = dict(initial)
+
+    def count(self, key, value=1):
+        with self._lock:
+            self._values[key] += value
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+
+class Cache:
+    """sqlite result cache opened on first use and shared by all threads."""
+
+    def __init__(self, path, schema):
+        self.path = path
+        self.schema = schema
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @contextmanager
+    def connect(self):
+        """Yield the connection under the cache lock and commit afterwards."""
+        with self._lock:
+            if self._conn is None:
+                #부모 디렉터리 없으면 생성
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.execute(self.schema)
+                self._conn.commit()
+            yield self._conn
+            self._conn.commit()
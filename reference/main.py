@@ -4,6 +4,8 @@
   - Description      : Top of the project
   - Owner            : Seokmin.Kang
   - Revision history : 1) 2024.11.23 : Initial release
+                       2) 2026.10.17 : Concurrent per-dept crawl
+                       3) 2026.10.17 : Deliver each notice as soon as it is summarized
 *******************************************************************'''
 # -*- coding: utf-8 -*-
 
@@ -14,10 +16,21 @@ from DeptInfo import DEPTS
 import DiscordMsg
 import Errors
 import Update
+import ListCache
+import SummaryCache
+import Checkpoint
+import SeenStore
+import Parser
+import DeliveryQueue
+import DataSource
+import OCR
+import Attachment
 from datetime import datetime
 
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 
 #exceptions
 from requests.exceptions import ConnectionError
@@ -27,49 +40,198 @@ MAX_RETRIES = 5  # 최대 재시도 횟수
 RETRY_DELAY = 5  # 재시도 간격 (초)
 TIMESTAMP_FILE = "buffers/update_timestamp.txt"
 
-CURRENT_DEPT = None
+try:
+    import Hyperparms
+    MAX_WORKERS = getattr(Hyperparms, "MAX_WORKERS", 4)
+except:
+    MAX_WORKERS = 4  # 동시에 처리할 학과 수 (1이면 순차 실행)
 
-def main():
-    global CURRENT_DEPT
 
-    for dept in DEPTS:
+def MarkDelivered(dept_id, url):
+    Checkpoint.RecordDelivered(dept_id, url)
+    SeenStore.MarkDelivered(dept_id, url)
+
+
+def IterDeptNotices(dept):
+    """Yield the notices of dept to deliver, journaling each one as it comes.
+
+    Notices summarized by an earlier attempt come first from the Checkpoint
+    journal (at most SeenStore.MAX_ATTEMPTS delivery attempts each); the
+    rest are streamed from Overview.IterNotice.
+    """
+    dept_id = dept.dept_id
+
+    # 이전 시도에서 요약까지 끝났지만 전달되지 않은 공지
+    journaled = Checkpoint.Pending(dept_id)
+    for title, url, summary in journaled:
+        # 마지막 시도는 미리 실패로 표시 (전달되면 전달 완료로 바뀜)
+        if Checkpoint.RecordAttempt(dept_id, url) >= SeenStore.MAX_ATTEMPTS:
+            SeenStore.MarkFailed(dept_id, url)
+        yield Overview.NoticeData(dept, title, url, summary)
 
-        CURRENT_DEPT = dept.dept_id
+    # 이번 실행의 이전 시도에서 모든 공지의 요약이 끝난 경우
+    if Checkpoint.IsFetched(dept_id):
+        return
 
-        #공지 정보 가져오기, 최신 공지 비교
-        notice_list = Overview.UpdateNotice(dept)
-        if notice_list is None:
+    #공지 정보 가져오기, 최신 공지 비교 (요약이 끝나는 대로 하나씩)
+    errors = []
+    journaled_urls = {url for title, url, summary in journaled}
+    for notice_data in Overview.IterNotice(dept, on_failed=partial(_NoticeFailed, dept_id, errors)):
+        if notice_data.url in journaled_urls:
             continue
+        Checkpoint.RecordSummarized(dept_id, [notice_data], fetched=False)
+        yield notice_data
+
+    #실패한 공지가 있으면 나머지 공지를 전달한 뒤 학과 실패로 보고 (재시도시 다시 가져옴)
+    if errors:
+        raise errors[0]
+
+    Checkpoint.RecordFetched(dept_id)
+
+
+def _NoticeFailed(dept_id, errors, url, e):
+    # 공지 자체의 문제만 시도 횟수에 포함 (연결 오류 제외, 실행마다 한번)
+    if not IsConnectionError(e) and Checkpoint.RecordFailed(dept_id, url):
+        SeenStore.RecordFailure(dept_id, url)
+    errors.append(e)
+
+
+def RunDept(dept):
+    """Fetch and summarize new notices of a single dept and queue each one
+    for delivery as soon as it is ready.
+
+    Progress is journaled in Checkpoint so a retry (or the next run after a
+    crash) resumes from the first undelivered notice.
+    """
+    dept_id = dept.dept_id
+
+    # 이전 시도에서 이미 끝난 학과
+    if Checkpoint.IsDone(dept_id):
+        return 0
+
+    # 전달 큐에 넣고 바로 다음 공지 진행 (채널 내 전달 순서는 게시판 순서 유지)
+    count = 0
+    for notice_data in IterDeptNotices(dept):
+
+        #최신 공지 전달
+        DeliveryQueue.EnqueueNotice(notice_data,
+                                    on_delivered=partial(MarkDelivered, dept_id, notice_data.url),
+                                    tag=dept)
+        count += 1
+
+    return count
+
+
+def RunDepts(depts, max_workers=MAX_WORKERS):
+    """Run RunDept for every dept, isolating failures per dept, and wait
+    for the queued deliveries.
+
+    Returns a list of (dept, exception) for the depts that failed.
+    """
+    failures = []
 
-        for notice_data in notice_list:
+    # 순차 실행
+    if max_workers <= 1:
+        for dept in depts:
+            try:
+                RunDept(dept)
+            except Exception as e:
+                failures.append((dept, e))
+        return _FinishDelivery(depts, failures)
 
-            #최신 공지 전달
-            DiscordMsg.SendEmbedMessage(notice_data)
-            
-            #최신 공지 갱신
-            #Update.UpdateLatest(notice_list['title'],dept.dept_id)
+    # 학과별 동시 실행 (학과 하나의 실패가 다른 학과에 영향을 주지 않음)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dept") as executor:
+        futures = {executor.submit(RunDept, dept): dept for dept in depts}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failures.append((futures[future], e))
 
+    return _FinishDelivery(depts, failures)
 
 
+def _FinishDelivery(depts, failures):
+    # 전달 완료 대기, 전달 실패도 학과별 실패로 취급
+    failures += DeliveryQueue.Join()
+
+    # 실패가 없는 학과만 완료 처리
+    failed_ids = {dept.dept_id for dept, e in failures}
+    for dept in depts:
+        if dept.dept_id not in failed_ids:
+            Checkpoint.RecordDone(dept.dept_id)
+
+    # 보고 순서를 DEPTS 순서로 고정
+    order = {dept.dept_id: i for i, dept in enumerate(depts)}
+    failures.sort(key=lambda failure: order[failure[0].dept_id])
+    return failures
+
+
+def IsConnectionError(e):
+    return isinstance(e, (ConnectionError, RemoteDisconnected))
+
+
+def ReportFailures(failures):
+    #학과별 오류는 디버그 메시지로 알림
+    for dept, e in failures:
+        debug_message = Errors.InfoCollect(e,dept.dept_id)
+        DiscordMsg.SendDebugMessage(debug_message)
+        print(debug_message)
+
+
+def FinishCycle():
     #최신화 시간 갱신
     formatted_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S") # format : 2024-12-24 14:35:22
     Update.UpdateLatest(formatted_time,file_path=TIMESTAMP_FILE)
 
-    return 0
+    #목록 캐시 적중률 출력
+    print(f"[ListCache] {ListCache.Stats()}")
+    print(f"[SummaryCache] {SummaryCache.Stats()}")
+    print(f"[Parser] {Parser.Stats()}")
+    print(f"[Pages] {Overview.PageStats()}")
+    print(f"[DataSource] {DataSource.Stats()}")
+    print(f"[OCR] {OCR.Stats()}")
+    print(f"[Attachment] {Attachment.Stats()}")
+    Parser.Clear()
+
+    #완료된 학과는 체크포인트에서 제거 (실패한 학과는 다음 실행에서 이어서 처리)
+    Checkpoint.Compact()
+
+
+def main():
+
+    failures = RunDepts(DEPTS)
+
+    #연결 오류는 재시도 루프에서 처리
+    for dept, e in failures:
+        if IsConnectionError(e):
+            raise e
+
+    #그 외 학과별 오류는 디버그 메시지로 알림
+    ReportFailures(failures)
+
+    FinishCycle()
+
+    return len(failures)
         
 if __name__ == "__main__":
+    #이전 실행의 완료/요약 완료 표시 제거 (연결 오류로 FinishCycle까지 가지 못한 경우)
+    #전달되지 않은 공지만 남겨두어 이어서 처리, 같은 실행의 재시도에서만 완료 학과 생략
+    Checkpoint.Compact()
+
     #연결 오류 발생시 반복
     for i in range(MAX_RETRIES):
         try:
-            main()
-            sys.exit(0)
+            failed = main()
+            sys.exit(1 if failed else 0)
         #연결 오류 발생시 재시도
         except (ConnectionError, RemoteDisconnected):
             time.sleep(RETRY_DELAY)
             continue
         #디스코드 에러 포함 여러 문제 발생시 카카오톡 알림
+        #(학과별 오류는 ReportFailures에서 학과와 함께 알리므로 여기서는 학과 이외의 단계)
         except Exception as e:
-            debug_message = Errors.InfoCollect(e,CURRENT_DEPT)
+            debug_message = Errors.InfoCollect(e,"main")
             #KakaoTalk.SendDebugMessage(debug_message,RECV_UUID)
             DiscordMsg.SendDebugMessage(debug_message)
             print(debug_message)
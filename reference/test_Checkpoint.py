@@ -0,0 +1,71 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : test_Checkpoint.py
+  - Description      : Regression tests of Checkpoint
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import types
+import unittest
+
+import Checkpoint
+
+
+def _notice(url):
+    return types.SimpleNamespace(title="제목", url=url, summary="요약")
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        # 테스트마다 임시 기록 사용
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.journal_file = Checkpoint.JOURNAL_FILE
+        Checkpoint.JOURNAL_FILE = os.path.join(self.tmpdir.name, "checkpoint.jsonl")
+        Checkpoint._state = None
+        Checkpoint._attempted.clear()
+
+    def tearDown(self):
+        Checkpoint.JOURNAL_FILE = self.journal_file
+        Checkpoint._state = None
+        Checkpoint._attempted.clear()
+        self.tmpdir.cleanup()
+
+    def _next_run(self):
+        # 실행 종료 후 새 프로세스에서 기록을 다시 읽는 경우
+        Checkpoint.Compact()
+        Checkpoint._state = None
+        Checkpoint._attempted.clear()
+
+    def test_retry_in_same_run_skips_done_and_fetched(self):
+        Checkpoint.RecordSummarized("d", [_notice("https://a.kr/1")])
+        Checkpoint.RecordDone("e")
+        self.assertTrue(Checkpoint.IsFetched("d"))
+        self.assertTrue(Checkpoint.IsDone("e"))
+        self.assertEqual(Checkpoint.RecordAttempt("d", "https://a.kr/1"), 1)
+
+    def test_undelivered_notice_in_fetched_dept(self):
+        # 전달이 계속 실패하는 공지 (예: 디스코드 400 응답)
+        Checkpoint.RecordSummarized("d", [_notice("https://a.kr/1"), _notice("https://a.kr/2")])
+        Checkpoint.RecordDelivered("d", "https://a.kr/2")
+
+        attempts = 1
+        while attempts < Checkpoint.MAX_ATTEMPTS:
+            self._next_run()
+            # 다음 실행에서는 게시판을 다시 확인하고 전달되지 않은 공지만 다시 전달
+            self.assertFalse(Checkpoint.IsFetched("d"))
+            self.assertEqual([url for _, url, _ in Checkpoint.Pending("d")], ["https://a.kr/1"])
+            attempts = Checkpoint.RecordAttempt("d", "https://a.kr/1")
+            # 같은 실행 안에서는 다시 세지 않음
+            self.assertEqual(Checkpoint.RecordAttempt("d", "https://a.kr/1"), attempts)
+
+        self._next_run()
+        self.assertEqual(Checkpoint.Pending("d"), [])
+        self.assertFalse(os.path.exists(Checkpoint.JOURNAL_FILE))
+
+
+if __name__ == '__main__':
+    unittest.main()
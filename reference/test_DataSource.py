@@ -0,0 +1,84 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : test_DataSource.py
+  - Description      : Fixture tests of the embedded / API JSON mappings
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import json
+import types
+import unittest
+
+import DataSource
+
+# Next.js 페이지 (__NEXT_DATA__에 목록 포함)
+NEXT_PAGE = """<html><head>
+<script type="application/ld+json">{"@type": "WebSite", "name": "창업지원단"}</script>
+</head><body><div id="__next"></div>
+<script id="__NEXT_DATA__" type="application/json">%s</script>
+</body></html>""" % json.dumps({
+    "props": {"pageProps": {
+        "menu": [{"name": "공지사항", "href": "/notice"}],
+        "data": {"content": [
+            {"id": 12, "title": "2026 창업경진대회 모집", "href": "https://startup.ssu.ac.kr/notice/12"},
+            {"id": 11, "title": " 멘토링 프로그램 안내 ", "href": "/notice/11"},
+            {"id": 10, "title": "", "href": "/notice/10"},
+        ]},
+    }},
+    "page": "/notice",
+}, ensure_ascii=False)
+
+# API 응답 (링크 없이 id만 있음)
+API_RESPONSE = json.dumps({
+    "result": {"total": 2, "list": [
+        {"boardSeq": 301, "subject": "장학금 신청 안내"},
+        {"boardSeq": 300, "subject": "수강신청 일정"},
+    ]},
+}, ensure_ascii=False)
+
+
+def _dept(data_source, url_prefix=""):
+    return types.SimpleNamespace(dept_id="test", url="https://a.kr/list?page={{page}}",
+                                 etc={"data_source": data_source, "url_prefix": url_prefix})
+
+
+class ExtractTest(unittest.TestCase):
+    def test_embedded_auto_discovery(self):
+        dept = _dept({"type": "embedded"}, "https://startup.ssu.ac.kr")
+        result = DataSource.Extract(dept, NEXT_PAGE)
+        # 메뉴 목록보다 긴 공지 목록 선택, 빈 제목 제외, url_prefix 제거
+        self.assertEqual(result, {"title": ["2026 창업경진대회 모집", "멘토링 프로그램 안내"],
+                                  "url": ["/notice/12", "/notice/11"]})
+
+    def test_embedded_list_path_and_url_format(self):
+        dept = _dept({"type": "embedded", "list_path": "props.pageProps.data.content",
+                      "url_format": "/board/view/{id}"})
+        result = DataSource.Extract(dept, NEXT_PAGE)
+        self.assertEqual(result["url"], ["/board/view/12", "/board/view/11"])
+
+    def test_api_with_url_format(self):
+        dept = _dept({"type": "api", "url_format": "/bbs/view?seq={boardSeq}"})
+        result = DataSource.Extract(dept, API_RESPONSE)
+        self.assertEqual(result, {"title": ["장학금 신청 안내", "수강신청 일정"],
+                                  "url": ["/bbs/view?seq=301", "/bbs/view?seq=300"]})
+
+    def test_api_list_path_and_keys(self):
+        dept = _dept({"type": "api", "list_path": "result.list", "title_key": "subject",
+                      "url_format": "/{boardSeq}"})
+        self.assertEqual(DataSource.Extract(dept, API_RESPONSE)["url"], ["/301", "/300"])
+
+    def test_no_list(self):
+        # 링크도 url_format도 없으면 목록으로 보지 않음 (브라우저로 대체)
+        self.assertEqual(DataSource.Extract(_dept({"type": "api"}), API_RESPONSE), {"title": [], "url": []})
+        self.assertEqual(DataSource.Extract(_dept({"type": "embedded"}), "<html></html>"),
+                         {"title": [], "url": []})
+
+    def test_wrong_list_path(self):
+        dept = _dept({"type": "api", "list_path": "result.items", "url_format": "/{boardSeq}"})
+        self.assertEqual(DataSource.Extract(dept, API_RESPONSE), {"title": [], "url": []})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+'''*******************************************************************
+  - Project          : The Eye Of Sauron
+  - File name        : test_SeenStore.py
+  - Description      : Regression tests of SeenStore
+  - Owner            : Seokmin.Kang
+  - Revision history : 1) 2026.10.17 : Initial release
+*******************************************************************'''
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+
+import SeenStore
+
+
+class UpdateStateTest(unittest.TestCase):
+    def setUp(self):
+        # 테스트마다 임시 저장소 사용
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store_file = SeenStore.STORE_FILE
+        SeenStore.STORE_FILE = os.path.join(self.tmpdir.name, "seen.db")
+        SeenStore._conn = None
+
+    def tearDown(self):
+        if SeenStore._conn is not None:
+            SeenStore._conn.close()
+        SeenStore._conn = None
+        SeenStore.STORE_FILE = self.store_file
+        self.tmpdir.cleanup()
+
+    def test_first_run_records_only(self):
+        self.assertEqual(SeenStore.UpdateState("d", ["https://a.kr/1", "https://a.kr/2"]), [])
+
+    def test_new_item_followed_by_known_items(self):
+        SeenStore.UpdateState("d", ["https://a.kr/1", "https://a.kr/2"])
+        new = SeenStore.UpdateState("d", ["https://a.kr/3", "https://a.kr/1", "https://a.kr/2"])
+        self.assertEqual(new, [0])
+
+    def test_undelivered_returned_until_failed(self):
+        SeenStore.UpdateState("d", ["https://a.kr/1"])
+        urls = ["https://a.kr/3", "https://a.kr/2", "https://a.kr/1"]
+        self.assertEqual(SeenStore.UpdateState("d", urls), [0, 1])
+
+        # 실패한 공지만 시도 횟수를 세고, 다시 확인하는 것만으로는 세지 않음
+        for _ in range(SeenStore.MAX_ATTEMPTS):
+            self.assertEqual(SeenStore.UpdateState("d", urls), [0, 1])
+            SeenStore.RecordFailure("d", "https://a.kr/3")
+        self.assertEqual(SeenStore.UpdateState("d", urls), [1])
+
+    def test_delivered_not_returned_again(self):
+        SeenStore.UpdateState("d", ["https://a.kr/1"])
+        SeenStore.UpdateState("d", ["https://a.kr/2", "https://a.kr/1"])
+        SeenStore.MarkDelivered("d", "https://a.kr/2")
+        self.assertEqual(SeenStore.UpdateState("d", ["https://a.kr/2", "https://a.kr/1"]), [])
+
+    def test_mark_seen(self):
+        SeenStore.UpdateState("d", ["https://a.kr/1"])
+        SeenStore.UpdateState("d", ["https://a.kr/2", "https://a.kr/1"])
+        SeenStore.MarkSeen("d", ["https://a.kr/2"])
+        self.assertEqual(SeenStore.UpdateState("d", ["https://a.kr/2", "https://a.kr/1"]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()